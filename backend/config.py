@@ -3,20 +3,33 @@ Configuration management for CampusConnect
 Loads settings from environment variables
 """
 import os
-from pydantic_settings import BaseSettings
+from functools import cached_property
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        frozen=True,
+    )
+
     # PostgreSQL
     postgres_host: str = os.getenv("POSTGRES_HOST", "localhost")
     postgres_port: int = int(os.getenv("POSTGRES_PORT", "5432"))
     postgres_db: str = os.getenv("POSTGRES_DB", "campusconnect")
     postgres_user: str = os.getenv("POSTGRES_USER", "campus_admin")
     postgres_password: str = os.getenv("POSTGRES_PASSWORD", "campus_pass_123")
+    postgres_pool_min_size: int = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "5"))
+    postgres_pool_max_size: int = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "25"))
 
     # Redis
     redis_host: str = os.getenv("REDIS_HOST", "localhost")
     redis_port: int = int(os.getenv("REDIS_PORT", "6379"))
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+    # In-process cache in front of Redis for user profiles / group summaries
+    local_cache_maxsize: int = int(os.getenv("LOCAL_CACHE_MAXSIZE", "10000"))
+    local_cache_ttl: float = float(os.getenv("LOCAL_CACHE_TTL", "30"))
 
     # MongoDB
     mongodb_host: str = os.getenv("MONGODB_HOST", "localhost")
@@ -24,27 +37,27 @@ class Settings(BaseSettings):
     mongodb_db: str = os.getenv("MONGODB_DB", "campusconnect")
     mongodb_user: str = os.getenv("MONGODB_USER", "campus_admin")
     mongodb_password: str = os.getenv("MONGODB_PASSWORD", "campus_pass_123")
+    mongodb_max_pool_size: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
 
     # Neo4j
     neo4j_uri: str = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     neo4j_user: str = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password: str = os.getenv("NEO4J_PASSWORD", "campus_pass_123")
+    neo4j_database: str = os.getenv("NEO4J_DATABASE", "neo4j")
+    neo4j_max_connection_pool_size: int = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "25"))
 
     # Application
     app_env: str = os.getenv("APP_ENV", "development")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
 
-    @property
+    # Settings are frozen, so the connection strings are built once and cached
+    @cached_property
     def postgres_dsn(self) -> str:
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
-    @property
+    @cached_property
     def mongodb_uri(self) -> str:
         return f"mongodb://{self.mongodb_user}:{self.mongodb_password}@{self.mongodb_host}:{self.mongodb_port}"
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-
 
 settings = Settings()
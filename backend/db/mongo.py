@@ -2,25 +2,192 @@
 MongoDB Client - Flexible Content Storage
 Handles posts, comments, and flexible document structures
 """
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from bson import ObjectId
+from pymongo import AsyncMongoClient, IndexModel
+from pymongo.errors import BulkWriteError, WriteError
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple, Union
+from datetime import datetime, timezone
+import asyncio
 import logging
 
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Index backing group feed queries: equality on group_id, newest first
+GROUP_FEED_INDEX = [("group_id", 1), ("created_at", -1)]
+
+# Post indexes that no query names in .hint(), so bulk_load_posts may drop
+# them while it inserts
+POST_UNHINTED_INDEXES = [
+    IndexModel("author_id"),
+    IndexModel([("created_at", -1)]),
+    IndexModel("tags"),
+]
+
+# Secondary indexes on posts. The compound feed index serves the group feed
+# (filter + sort) and makes a separate single-key group_id index redundant
+POST_INDEXES = [IndexModel(GROUP_FEED_INDEX), *POST_UNHINTED_INDEXES]
+
+COMMENT_INDEXES = [
+    IndexModel("post_id"),
+    IndexModel("author_id"),
+    IndexModel([("created_at", -1)]),
+]
+
+# Projection for list views that only render post metadata
+POST_SUMMARY_PROJECTION = {"body": 0, "attachments": 0}
+
+# Projection for the group feed: exactly the fields PostResponse renders
+POST_FEED_PROJECTION = {
+    "author_id": 1,
+    "author_name": 1,
+    "author_email": 1,
+    "group_id": 1,
+    "type": 1,
+    "title": 1,
+    "body": 1,
+    "tags": 1,
+    "attachments": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+
+def _object_id(value: Union[str, ObjectId]) -> ObjectId:
+    """Parse a hex id, reusing an ObjectId the caller already holds"""
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+class InsertBatcher:
+    """
+    Coalesces concurrent single-document inserts into insert_many batches
+
+    Callers await insert() as if it were insert_one; a background task
+    writes whatever is queued (up to max_batch documents) with one unordered
+    insert_many round-trip. A lone insert is written straight away; only
+    when others are already queued behind it does the task wait max_wait
+    seconds for more to join. timestamp_fields are stamped with one shared
+    UTC time per write.
+    """
+
+    def __init__(
+        self,
+        timestamp_fields: Tuple[str, ...] = ("created_at",),
+        max_batch: int = 200,
+        max_wait: float = 0.01,
+    ):
+        self.timestamp_fields = timestamp_fields
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.collection = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, collection):
+        """Start the background flush task for a collection"""
+        self.collection = collection
+        self._queue = asyncio.Queue()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush pending documents and stop the background task"""
+        if self._task and not self._task.done():
+            # Inserts from here on go straight to insert_one instead of
+            # queueing behind the sentinel, where nothing would flush them
+            self._closing = True
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+    async def insert(self, document: Dict[str, Any]) -> Any:
+        """Queue a document for the next batch and return its inserted _id"""
+        if self._closing or self._task is None or self._task.done():
+            self._stamp([document])
+            result = await self.collection.insert_one(document)
+            return result.inserted_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((document, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            closing = self._drain(batch)
+            if len(batch) > 1 and len(batch) < self.max_batch and not closing:
+                # Concurrent callers are arriving: give more a moment to join
+                await asyncio.sleep(self.max_wait)
+                closing = self._drain(batch)
+
+            await self._flush(batch)
+            if closing:
+                return
+
+    def _drain(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> bool:
+        """Move queued items into batch (up to max_batch); True on the stop sentinel"""
+        while len(batch) < self.max_batch and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    def _stamp(self, documents: List[Dict[str, Any]]):
+        now = datetime.now(timezone.utc)
+        for document in documents:
+            for field in self.timestamp_fields:
+                document[field] = now
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        documents = [document for document, _ in batch]
+        failed: Dict[int, Exception] = {}
+        self._stamp(documents)
+
+        try:
+            # Unordered so one bad document doesn't stall the rest of the batch
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = WriteError(
+                    error.get("errmsg"), error.get("code"), error
+                )
+        except Exception as e:
+            logger.error(f"Batched insert into {self.collection.name} failed: {e}")
+            failed = {index: e for index in range(len(batch))}
+
+        for index, (document, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(document["_id"])
+
+        logger.debug(f"Flushed {len(batch)} documents into {self.collection.name}")
+
 
 class MongoClient:
     def __init__(self):
-        self.client: Optional[AsyncIOMotorClient] = None
+        self.client: Optional[AsyncMongoClient] = None
         self.db = None
+        self._post_writer = InsertBatcher(timestamp_fields=("created_at", "updated_at"))
+        self._comment_writer = InsertBatcher(timestamp_fields=("created_at",))
 
     async def connect(self):
         """Initialize MongoDB connection"""
         try:
-            self.client = AsyncIOMotorClient(settings.mongodb_uri)
+            # Native asyncio driver: no thread-pool hop per operation (unlike Motor)
+            # tz_aware so stored UTC timestamps read back as aware datetimes
+            self.client = AsyncMongoClient(
+                settings.mongodb_uri, maxPoolSize=settings.mongodb_max_pool_size, tz_aware=True
+            )
             self.db = self.client[settings.mongodb_db]
             # Test connection
             await self.client.admin.command("ping")
@@ -28,29 +195,28 @@ class MongoClient:
 
             # Create indexes
             await self._create_indexes()
+
+            # Start write coalescing for posts and comments
+            self._post_writer.start(self.db.posts)
+            self._comment_writer.start(self.db.comments)
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
     async def _create_indexes(self):
-        """Create indexes for better query performance"""
-        # Posts indexes
-        await self.db.posts.create_index("group_id")
-        await self.db.posts.create_index("author_id")
-        await self.db.posts.create_index([("created_at", -1)])
-        await self.db.posts.create_index("tags")
-
-        # Comments indexes
-        await self.db.comments.create_index("post_id")
-        await self.db.comments.create_index("author_id")
-        await self.db.comments.create_index([("created_at", -1)])
-
+        """Create indexes for better query performance (one command per collection)"""
+        await asyncio.gather(
+            self.db.posts.create_indexes(POST_INDEXES),
+            self.db.comments.create_indexes(COMMENT_INDEXES),
+        )
         logger.info("MongoDB indexes created")
 
     async def disconnect(self):
         """Close MongoDB connection"""
+        await self._post_writer.stop()
+        await self._comment_writer.stop()
         if self.client:
-            self.client.close()
+            await self.client.close()
             logger.info("MongoDB connection closed")
 
     # Post operations
@@ -63,31 +229,83 @@ class MongoClient:
         body: str,
         tags: List[str] = None,
         attachments: List[Dict[str, Any]] = None,
+        author_name: Optional[str] = None,
+        author_email: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Create a new post"""
+        """
+        Create a new post (created_at/updated_at are set when it is written)
+        author_name/author_email are denormalized copies so reads need no join
+        """
         post = {
             "author_id": author_id,
+            "author_name": author_name,
+            "author_email": author_email,
             "group_id": group_id,
             "type": post_type,  # "resource", "question", "note"
             "title": title,
             "body": body,
             "tags": tags or [],
             "attachments": attachments or [],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
         }
 
-        result = await self.db.posts.insert_one(post)
-        post["_id"] = str(result.inserted_id)
+        post["_id"] = str(await self._post_writer.insert(post))
         logger.info(f"Created post {post['_id']} in group {group_id}")
         return post
 
-    async def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
-        """Get post by ID"""
-        from bson import ObjectId
+    async def create_posts_bulk(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many posts with one unordered insert_many
+        Each item takes create_post's keyword arguments; returns the posts in
+        input order with _id set
+        """
+        now = datetime.now(timezone.utc)
+        documents = [
+            {
+                "author_id": post["author_id"],
+                "group_id": post["group_id"],
+                "type": post["post_type"],
+                "title": post["title"],
+                "body": post["body"],
+                "tags": post.get("tags") or [],
+                "attachments": post.get("attachments") or [],
+                "author_name": post.get("author_name"),
+                "author_email": post.get("author_email"),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for post in posts
+        ]
+        if not documents:
+            return []
+
+        result = await self.db.posts.insert_many(documents, ordered=False)
+        for document, inserted_id in zip(documents, result.inserted_ids):
+            document["_id"] = str(inserted_id)
+        logger.info(f"Created {len(documents)} posts")
+        return documents
+
+    async def bulk_load_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        create_posts_bulk with less per-document index maintenance: drops the
+        unhinted post indexes, inserts, then rebuilds them in one pass
+        GROUP_FEED_INDEX stays, since the feed queries hint it; queries by
+        author or tag fall back to collection scans while this runs
+        """
+        await asyncio.gather(
+            *(
+                self.db.posts.drop_index(index.document["name"])
+                for index in POST_UNHINTED_INDEXES
+            )
+        )
+        try:
+            return await self.create_posts_bulk(posts)
+        finally:
+            await self.db.posts.create_indexes(POST_UNHINTED_INDEXES)
 
+    async def get_post(self, post_id: Union[str, ObjectId]) -> Optional[Dict[str, Any]]:
+        """Get post by ID"""
         try:
-            post = await self.db.posts.find_one({"_id": ObjectId(post_id)})
+            post = await self.db.posts.find_one({"_id": _object_id(post_id)})
             if post:
                 post["_id"] = str(post["_id"])
             return post
@@ -95,25 +313,79 @@ class MongoClient:
             logger.error(f"Error fetching post {post_id}: {e}")
             return None
 
+    async def get_posts_by_ids(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get many posts in one $in query, in the order of post_ids
+        Malformed and missing ids are skipped
+        """
+        object_ids = [_object_id(post_id) for post_id in post_ids if ObjectId.is_valid(post_id)]
+        if not object_ids:
+            return []
+
+        cursor = self.db.posts.find({"_id": {"$in": object_ids}}).batch_size(len(object_ids))
+        posts = {post["_id"]: post for post in await cursor.to_list(length=len(object_ids))}
+
+        ordered = []
+        for object_id in object_ids:
+            post = posts.get(object_id)
+            if post:
+                post["_id"] = str(post["_id"])
+                ordered.append(post)
+        return ordered
+
+    async def post_exists(self, post_id: Union[str, ObjectId]) -> bool:
+        """Check a post exists without fetching the document"""
+        post = await self.db.posts.find_one({"_id": _object_id(post_id)}, {"_id": 1})
+        return post is not None
+
     async def get_group_posts(
-        self, group_id: int, limit: int = 20, skip: int = 0
+        self,
+        group_id: int,
+        limit: int = 20,
+        skip: int = 0,
+        projection: Optional[Dict[str, int]] = None,
     ) -> List[Dict[str, Any]]:
-        """Get posts for a group (paginated, sorted by newest first)"""
+        """
+        Get posts for a group (paginated, sorted by newest first)
+        Pass POST_SUMMARY_PROJECTION to skip body/attachments for list views
+        """
         cursor = (
-            self.db.posts.find({"group_id": group_id})
+            self.db.posts.find({"group_id": group_id}, projection)
             .sort("created_at", -1)
+            .hint(GROUP_FEED_INDEX)
             .skip(skip)
             .limit(limit)
+            .batch_size(limit)
         )
 
-        posts = []
-        async for post in cursor:
+        # Fetch the whole page in one batch, then stringify ids in one pass
+        posts = await cursor.to_list(length=limit)
+        for post in posts:
             post["_id"] = str(post["_id"])
-            posts.append(post)
 
         logger.debug(f"Retrieved {len(posts)} posts for group {group_id}")
         return posts
 
+    async def iter_group_posts(
+        self, group_id: int, batch_size: int = 200
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all posts for a group, newest first
+        Memory is bounded by batch_size rather than the group's post count
+        """
+        cursor = (
+            self.db.posts.find({"group_id": group_id})
+            .sort("created_at", -1)
+            .hint(GROUP_FEED_INDEX)
+            .batch_size(batch_size)
+        )
+        try:
+            async for post in cursor:
+                post["_id"] = str(post["_id"])
+                yield post
+        finally:
+            await cursor.close()
+
     async def get_user_posts(
         self, author_id: int, limit: int = 20
     ) -> List[Dict[str, Any]]:
@@ -122,12 +394,12 @@ class MongoClient:
             self.db.posts.find({"author_id": author_id})
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
 
-        posts = []
-        async for post in cursor:
+        posts = await cursor.to_list(length=limit)
+        for post in posts:
             post["_id"] = str(post["_id"])
-            posts.append(post)
 
         return posts
 
@@ -139,55 +411,81 @@ class MongoClient:
             self.db.posts.find({"tags": {"$in": tags}})
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
 
-        posts = []
-        async for post in cursor:
+        posts = await cursor.to_list(length=limit)
+        for post in posts:
             post["_id"] = str(post["_id"])
-            posts.append(post)
 
         return posts
 
     # Comment operations
     async def create_comment(
-        self, post_id: str, author_id: int, body: str
+        self,
+        post_id: Union[str, ObjectId],
+        author_id: int,
+        body: str,
+        author_name: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Create a comment on a post"""
-        from bson import ObjectId
-
+        """Create a comment on a post, with a denormalized copy of the author's name"""
         comment = {
-            "post_id": ObjectId(post_id),
+            "post_id": _object_id(post_id),
             "author_id": author_id,
+            "author_name": author_name,
             "body": body,
-            "created_at": datetime.utcnow(),
         }
 
-        result = await self.db.comments.insert_one(comment)
-        comment["_id"] = str(result.inserted_id)
-        comment["post_id"] = post_id
+        comment["_id"] = str(await self._comment_writer.insert(comment))
+        comment["post_id"] = str(post_id)
         logger.info(f"Created comment {comment['_id']} on post {post_id}")
         return comment
 
+    async def delete_comment(self, comment_id: Union[str, ObjectId]) -> bool:
+        """Delete a comment, returning whether it existed"""
+        result = await self.db.comments.delete_one({"_id": _object_id(comment_id)})
+        return result.deleted_count > 0
+
     async def get_post_comments(
-        self, post_id: str, limit: int = 50
+        self, post_id: Union[str, ObjectId], limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get comments for a post"""
-        from bson import ObjectId
-
         cursor = (
-            self.db.comments.find({"post_id": ObjectId(post_id)})
+            self.db.comments.find({"post_id": _object_id(post_id)})
             .sort("created_at", 1)
             .limit(limit)
+            .batch_size(limit)
         )
 
-        comments = []
-        async for comment in cursor:
+        comments = await cursor.to_list(length=limit)
+        for comment in comments:
             comment["_id"] = str(comment["_id"])
             comment["post_id"] = str(comment["post_id"])
-            comments.append(comment)
 
         return comments
 
+    async def delete_post(self, post_id: Union[str, ObjectId]) -> bool:
+        """Delete a post, returning whether it existed"""
+        result = await self.db.posts.delete_one({"_id": _object_id(post_id)})
+        return result.deleted_count > 0
+
+    async def delete_post_comments(self, post_id: Union[str, ObjectId]) -> int:
+        """Delete all comments on a post, returning how many were removed"""
+        result = await self.db.comments.delete_many({"post_id": _object_id(post_id)})
+        return result.deleted_count
+
+    async def update_author_name(self, author_id: int, full_name: str) -> int:
+        """
+        Refresh the denormalized author_name on a user's posts and comments
+        Returns how many documents were updated
+        """
+        update = {"$set": {"author_name": full_name}}
+        posts, comments = await asyncio.gather(
+            self.db.posts.update_many({"author_id": author_id}, update),
+            self.db.comments.update_many({"author_id": author_id}, update),
+        )
+        return posts.modified_count + comments.modified_count
+
     async def get_post_count(self, group_id: int) -> int:
         """Get total number of posts in a group"""
         count = await self.db.posts.count_documents({"group_id": group_id})
@@ -2,18 +2,156 @@
 Neo4j Client - Graph Relationships
 Handles social graph: friendships, group memberships, recommendations
 """
-from neo4j import AsyncGraphDatabase
-from typing import Optional, List, Dict, Any
+import asyncio
+from neo4j import AsyncGraphDatabase, RoutingControl
+from neo4j.exceptions import ClientError
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Connections opened at startup
+NEO4J_WARM_CONNECTIONS = 5
+
+RECOMMEND_FRIENDS_QUERY = """
+MATCH (me:User {id: $user_id})-[:FRIEND]->(friend)-[:FRIEND]->(fof:User)
+WHERE me <> fof
+  AND NOT (me)-[:FRIEND]->(fof)
+WITH fof, COUNT(DISTINCT friend) as mutual_friends
+ORDER BY mutual_friends DESC
+LIMIT $limit
+RETURN fof.id as user_id, fof.full_name as full_name,
+       fof.email as email, mutual_friends
+"""
+
+# Bounded variant: APOC stops expanding after $path_limit friend-of-friend
+# paths, so high-degree users don't enumerate their whole 2-hop
+# neighbourhood. Mutual counts are taken over the paths visited.
+RECOMMEND_FRIENDS_BOUNDED_QUERY = """
+MATCH (me:User {id: $user_id})
+CALL apoc.path.expandConfig(me, {
+    relationshipFilter: 'FRIEND>',
+    minLevel: 2,
+    maxLevel: 2,
+    uniqueness: 'NODE_PATH',
+    limit: $path_limit
+}) YIELD path
+WITH me, last(nodes(path)) as fof
+WHERE NOT (me)-[:FRIEND]->(fof)
+WITH fof, COUNT(*) as mutual_friends
+ORDER BY mutual_friends DESC
+LIMIT $limit
+RETURN fof.id as user_id, fof.full_name as full_name,
+       fof.email as email, mutual_friends
+"""
+
+# Paths explored per requested recommendation by the bounded query
+RECOMMEND_FRIENDS_PATHS_PER_RESULT = 20
+
+RECOMMEND_GROUPS_QUERY = """
+MATCH (me:User {id: $user_id})-[:FRIEND]->(friend)-[:MEMBER_OF]->(g:Group)
+WHERE NOT (me)-[:MEMBER_OF]->(g)
+WITH g, COUNT(DISTINCT friend) as friend_count
+ORDER BY friend_count DESC
+LIMIT $limit
+RETURN g.id as group_id, g.name as name,
+       g.course_code as course_code, friend_count
+"""
+
+
+def _recommend_all_query(friends_query: str) -> str:
+    """
+    Friend and group recommendations as one statement: each query runs as a
+    subquery and is collected into a list, so both come back in one record
+    """
+    return f"""
+CALL {{{friends_query}}}
+WITH collect({{user_id: user_id, full_name: full_name, email: email,
+               mutual_friends: mutual_friends}}) as friends
+CALL {{{RECOMMEND_GROUPS_QUERY}}}
+WITH friends, collect({{group_id: group_id, name: name, course_code: course_code,
+                        friend_count: friend_count}}) as groups
+RETURN friends, groups
+"""
+
+
+RECOMMEND_ALL_QUERY = _recommend_all_query(RECOMMEND_FRIENDS_QUERY)
+RECOMMEND_ALL_BOUNDED_QUERY = _recommend_all_query(RECOMMEND_FRIENDS_BOUNDED_QUERY)
+
+FRIENDS_QUERY = """
+MATCH (u:User {id: $user_id})-[:FRIEND]->(friend:User)
+RETURN friend.id as user_id, friend.full_name as full_name, friend.email as email
+ORDER BY friend.full_name
+"""
+
+COMMON_GROUPS_QUERY = """
+MATCH (u1:User {id: $user1_id})-[:MEMBER_OF]->(g:Group)<-[:MEMBER_OF]-(u2:User {id: $user2_id})
+RETURN g.id as group_id, g.name as name, g.course_code as course_code
+"""
+
+UPDATE_USER_NAME_QUERY = """
+MATCH (u:User {id: $user_id})
+SET u.full_name = $full_name
+"""
+
+# Candidate groups for multi-signal recommendations: groups the user isn't in
+# that either have $min_friends+ of their friends or share a course prefix
+# (the part of course_code before '-') with one of the user's groups.
+# Candidates come from the friends' groups and an indexed course_code prefix
+# match, never a scan of every group; friend_count is the candidate's
+# friends-in-group count whichever branch found it.
+GROUP_CANDIDATES_QUERY = """
+MATCH (me:User {id: $user_id})
+OPTIONAL MATCH (me)-[:MEMBER_OF]->(mine:Group)
+WITH me, collect(DISTINCT split(mine.course_code, '-')[0]) as my_prefixes
+CALL {
+    WITH me
+    MATCH (me)-[:FRIEND]->(friend)-[:MEMBER_OF]->(g:Group)
+    WITH g, COUNT(DISTINCT friend) as friends
+    WHERE friends >= $min_friends
+    RETURN g
+    UNION
+    WITH my_prefixes
+    UNWIND my_prefixes as prefix
+    MATCH (g:Group)
+    WHERE g.course_code STARTS WITH prefix + '-' OR g.course_code = prefix
+    RETURN g
+}
+WITH me, my_prefixes, g
+WHERE NOT (me)-[:MEMBER_OF]->(g)
+RETURN g.id as group_id, g.name as name, g.course_code as course_code,
+       COUNT { (me)-[:FRIEND]->(:User)-[:MEMBER_OF]->(g) } as friend_count,
+       split(g.course_code, '-')[0] IN my_prefixes as course_match
+"""
+
+
+def _friend_recommendation(record) -> Dict[str, Any]:
+    return {
+        "user_id": record["user_id"],
+        "full_name": record["full_name"],
+        "email": record["email"],
+        "mutual_friends": record["mutual_friends"],
+        "reason": f"{record['mutual_friends']} mutual friends",
+    }
+
+
+def _group_recommendation(record) -> Dict[str, Any]:
+    return {
+        "group_id": record["group_id"],
+        "name": record["name"],
+        "course_code": record["course_code"],
+        "friend_count": record["friend_count"],
+        "reason": f"{record['friend_count']} friends in this group",
+    }
+
 
 class Neo4jClient:
     def __init__(self):
         self.driver = None
+        self._friends_query = RECOMMEND_FRIENDS_QUERY
+        self._recommend_all_query = RECOMMEND_ALL_QUERY
 
     async def connect(self):
         """Initialize Neo4j connection"""
@@ -21,32 +159,52 @@ class Neo4jClient:
             self.driver = AsyncGraphDatabase.driver(
                 settings.neo4j_uri,
                 auth=(settings.neo4j_user, settings.neo4j_password),
+                max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+                connection_acquisition_timeout=30,
+                keep_alive=True,
             )
-            # Test connection
-            async with self.driver.session() as session:
-                await session.run("RETURN 1")
+            # Test connection, opening a few pooled connections while at it
+            await asyncio.gather(*(self.ping() for _ in range(NEO4J_WARM_CONNECTIONS)))
             logger.info("Neo4j connection established")
 
             # Create constraints and indexes
             await self._create_constraints()
+
+            await self._detect_apoc()
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
             raise
 
     async def _create_constraints(self):
         """Create uniqueness constraints and indexes"""
-        async with self.driver.session() as session:
-            # User node constraint
-            await session.run(
-                "CREATE CONSTRAINT user_id_unique IF NOT EXISTS "
-                "FOR (u:User) REQUIRE u.id IS UNIQUE"
-            )
-            # Group node constraint
-            await session.run(
-                "CREATE CONSTRAINT group_id_unique IF NOT EXISTS "
-                "FOR (g:Group) REQUIRE g.id IS UNIQUE"
-            )
-            logger.info("Neo4j constraints created")
+        # User node constraint
+        await self._write(
+            "CREATE CONSTRAINT user_id_unique IF NOT EXISTS "
+            "FOR (u:User) REQUIRE u.id IS UNIQUE"
+        )
+        # Group node constraint
+        await self._write(
+            "CREATE CONSTRAINT group_id_unique IF NOT EXISTS "
+            "FOR (g:Group) REQUIRE g.id IS UNIQUE"
+        )
+        # Range index: serves course_code prefix (STARTS WITH) lookups
+        await self._write(
+            "CREATE INDEX group_course_code IF NOT EXISTS "
+            "FOR (g:Group) ON (g.course_code)"
+        )
+        logger.info("Neo4j constraints created")
+
+    async def _detect_apoc(self):
+        """Use the bounded APOC friend query when the plugin is installed"""
+        try:
+            await self._read("RETURN apoc.version() as version")
+            self._friends_query = RECOMMEND_FRIENDS_BOUNDED_QUERY
+            self._recommend_all_query = RECOMMEND_ALL_BOUNDED_QUERY
+            logger.info("APOC available, using bounded friend recommendations")
+        except ClientError:
+            self._friends_query = RECOMMEND_FRIENDS_QUERY
+            self._recommend_all_query = RECOMMEND_ALL_QUERY
+            logger.info("APOC not available, using full friend-of-friend expansion")
 
     async def disconnect(self):
         """Close Neo4j connection"""
@@ -54,82 +212,204 @@ class Neo4jClient:
             await self.driver.close()
             logger.info("Neo4j connection closed")
 
+    # Query helpers
+    #
+    # driver.execute_query runs each statement in a managed transaction on the
+    # driver's shared session (with transient-error retries), instead of
+    # opening and tearing down a session per call. Naming the database up
+    # front also skips the home-database lookup round-trip.
+    async def _read(self, query: str, **params) -> List[Any]:
+        """Run a read query routed to a reader, return its records"""
+        records, _, _ = await self.driver.execute_query(
+            query,
+            params,
+            routing_=RoutingControl.READ,
+            database_=settings.neo4j_database,
+        )
+        return records
+
+    async def _write(self, query: str, **params) -> List[Any]:
+        """Run a write query routed to the leader, return its records"""
+        records, _, _ = await self.driver.execute_query(
+            query,
+            params,
+            routing_=RoutingControl.WRITE,
+            database_=settings.neo4j_database,
+        )
+        return records
+
+    async def ping(self):
+        """Round-trip a trivial read to check the database is reachable"""
+        await self._read("RETURN 1")
+
     # Node operations
     async def create_user_node(self, user_id: int, email: str, full_name: str):
         """Create User node in graph"""
-        async with self.driver.session() as session:
-            await session.run(
-                """
-                MERGE (u:User {id: $user_id})
-                SET u.email = $email, u.full_name = $full_name
-                RETURN u
-                """,
-                user_id=user_id,
-                email=email,
-                full_name=full_name,
-            )
-            logger.info(f"Created User node {user_id} in Neo4j")
+        await self._write(
+            """
+            MERGE (u:User {id: $user_id})
+            SET u.email = $email, u.full_name = $full_name
+            RETURN u
+            """,
+            user_id=user_id,
+            email=email,
+            full_name=full_name,
+        )
+        logger.info(f"Created User node {user_id} in Neo4j")
 
     async def create_group_node(self, group_id: int, name: str, course_code: str):
         """Create Group node in graph"""
-        async with self.driver.session() as session:
-            await session.run(
-                """
-                MERGE (g:Group {id: $group_id})
-                SET g.name = $name, g.course_code = $course_code
-                RETURN g
-                """,
-                group_id=group_id,
-                name=name,
-                course_code=course_code,
-            )
-            logger.info(f"Created Group node {group_id} in Neo4j")
+        await self._write(
+            """
+            MERGE (g:Group {id: $group_id})
+            SET g.name = $name, g.course_code = $course_code
+            RETURN g
+            """,
+            group_id=group_id,
+            name=name,
+            course_code=course_code,
+        )
+        logger.info(f"Created Group node {group_id} in Neo4j")
+
+    async def create_user_nodes(self, users: List[Dict[str, Any]]):
+        """Create many User nodes in one UNWIND statement"""
+        if not users:
+            return
+        rows = [
+            {"id": user["id"], "email": user["email"], "full_name": user["full_name"]}
+            for user in users
+        ]
+        await self._write(
+            """
+            UNWIND $rows AS row
+            MERGE (u:User {id: row.id})
+            SET u.email = row.email, u.full_name = row.full_name
+            """,
+            rows=rows,
+        )
+        logger.info(f"Created {len(rows)} User nodes in Neo4j")
+
+    async def create_group_nodes(self, groups: List[Dict[str, Any]]):
+        """Create many Group nodes in one UNWIND statement"""
+        if not groups:
+            return
+        rows = [
+            {"id": group["id"], "name": group["name"], "course_code": group["course_code"]}
+            for group in groups
+        ]
+        await self._write(
+            """
+            UNWIND $rows AS row
+            MERGE (g:Group {id: row.id})
+            SET g.name = row.name, g.course_code = row.course_code
+            """,
+            rows=rows,
+        )
+        logger.info(f"Created {len(rows)} Group nodes in Neo4j")
 
     # Relationship operations
     async def create_friendship(self, user1_id: int, user2_id: int):
         """Create bidirectional FRIEND relationship"""
-        async with self.driver.session() as session:
-            await session.run(
-                """
-                MATCH (u1:User {id: $user1_id})
-                MATCH (u2:User {id: $user2_id})
-                MERGE (u1)-[:FRIEND]->(u2)
-                MERGE (u2)-[:FRIEND]->(u1)
-                """,
-                user1_id=user1_id,
-                user2_id=user2_id,
-            )
-            logger.info(f"Created friendship between {user1_id} and {user2_id}")
+        await self._write(
+            """
+            MATCH (u1:User {id: $user1_id})
+            MATCH (u2:User {id: $user2_id})
+            MERGE (u1)-[:FRIEND]->(u2)
+            MERGE (u2)-[:FRIEND]->(u1)
+            SET u1.degree = COUNT { (u1)-[:FRIEND]->() },
+                u2.degree = COUNT { (u2)-[:FRIEND]->() }
+            """,
+            user1_id=user1_id,
+            user2_id=user2_id,
+        )
+        logger.info(f"Created friendship between {user1_id} and {user2_id}")
 
     async def create_membership(self, user_id: int, group_id: int, role: str = "member"):
         """Create MEMBER_OF relationship"""
-        async with self.driver.session() as session:
-            await session.run(
-                """
-                MATCH (u:User {id: $user_id})
-                MATCH (g:Group {id: $group_id})
-                MERGE (u)-[r:MEMBER_OF]->(g)
-                SET r.role = $role
-                """,
-                user_id=user_id,
-                group_id=group_id,
-                role=role,
-            )
-            logger.info(f"Created membership: User {user_id} -> Group {group_id}")
+        await self._write(
+            """
+            MATCH (u:User {id: $user_id})
+            MATCH (g:Group {id: $group_id})
+            MERGE (u)-[r:MEMBER_OF]->(g)
+            SET r.role = $role
+            """,
+            user_id=user_id,
+            group_id=group_id,
+            role=role,
+        )
+        logger.info(f"Created membership: User {user_id} -> Group {group_id}")
+
+    async def remove_membership(self, user_id: int, group_id: int):
+        """Delete MEMBER_OF relationship"""
+        await self._write(
+            """
+            MATCH (u:User {id: $user_id})-[r:MEMBER_OF]->(g:Group {id: $group_id})
+            DELETE r
+            """,
+            user_id=user_id,
+            group_id=group_id,
+        )
+        logger.info(f"Removed membership: User {user_id} -> Group {group_id}")
+
+    async def create_friendships(self, pairs: List[Tuple[int, int]]):
+        """Create many bidirectional FRIEND relationships in one UNWIND statement"""
+        if not pairs:
+            return
+        rows = [{"user1_id": user1_id, "user2_id": user2_id} for user1_id, user2_id in pairs]
+        await self._write(
+            """
+            UNWIND $rows AS row
+            MATCH (u1:User {id: row.user1_id})
+            MATCH (u2:User {id: row.user2_id})
+            MERGE (u1)-[:FRIEND]->(u2)
+            MERGE (u2)-[:FRIEND]->(u1)
+            WITH collect(u1) + collect(u2) AS touched
+            UNWIND touched AS u
+            WITH DISTINCT u
+            SET u.degree = COUNT { (u)-[:FRIEND]->() }
+            """,
+            rows=rows,
+        )
+        logger.info(f"Created {len(rows)} friendships")
+
+    async def create_memberships(self, memberships: List[Dict[str, Any]]):
+        """
+        Create many MEMBER_OF relationships in one UNWIND statement
+        Each membership is a dict with user_id, group_id and role
+        """
+        if not memberships:
+            return
+        rows = [
+            {
+                "user_id": membership["user_id"],
+                "group_id": membership["group_id"],
+                "role": membership.get("role", "member"),
+            }
+            for membership in memberships
+        ]
+        await self._write(
+            """
+            UNWIND $rows AS row
+            MATCH (u:User {id: row.user_id})
+            MATCH (g:Group {id: row.group_id})
+            MERGE (u)-[r:MEMBER_OF]->(g)
+            SET r.role = row.role
+            """,
+            rows=rows,
+        )
+        logger.info(f"Created {len(rows)} memberships")
 
     async def are_friends(self, user1_id: int, user2_id: int) -> bool:
         """Check if two users are friends"""
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (u1:User {id: $user1_id})-[:FRIEND]->(u2:User {id: $user2_id})
-                RETURN COUNT(*) > 0 as are_friends
-                """,
-                user1_id=user1_id,
-                user2_id=user2_id,
-            )
-            record = await result.single()
-            return record["are_friends"] if record else False
+        records = await self._read(
+            """
+            MATCH (u1:User {id: $user1_id})-[:FRIEND]->(u2:User {id: $user2_id})
+            RETURN COUNT(*) > 0 as are_friends
+            """,
+            user1_id=user1_id,
+            user2_id=user2_id,
+        )
+        return records[0]["are_friends"] if records else False
 
     # Recommendation queries
     async def recommend_friends(
@@ -139,36 +419,16 @@ class Neo4jClient:
         Recommend friends-of-friends who are not already friends
         Returns mutual friend count for ranking
         """
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (me:User {id: $user_id})-[:FRIEND]->(friend)-[:FRIEND]->(fof:User)
-                WHERE me <> fof
-                  AND NOT (me)-[:FRIEND]->(fof)
-                WITH fof, COUNT(DISTINCT friend) as mutual_friends
-                ORDER BY mutual_friends DESC
-                LIMIT $limit
-                RETURN fof.id as user_id, fof.full_name as full_name,
-                       fof.email as email, mutual_friends
-                """,
-                user_id=user_id,
-                limit=limit,
-            )
+        records = await self._read(
+            self._friends_query,
+            user_id=user_id,
+            limit=limit,
+            path_limit=limit * RECOMMEND_FRIENDS_PATHS_PER_RESULT,
+        )
+        recommendations = [_friend_recommendation(record) for record in records]
 
-            recommendations = []
-            async for record in result:
-                recommendations.append(
-                    {
-                        "user_id": record["user_id"],
-                        "full_name": record["full_name"],
-                        "email": record["email"],
-                        "mutual_friends": record["mutual_friends"],
-                        "reason": f"{record['mutual_friends']} mutual friends",
-                    }
-                )
-
-            logger.debug(f"Found {len(recommendations)} friend recommendations for user {user_id}")
-            return recommendations
+        logger.debug(f"Found {len(recommendations)} friend recommendations for user {user_id}")
+        return recommendations
 
     async def recommend_groups(
         self, user_id: int, limit: int = 10
@@ -178,71 +438,101 @@ class Neo4jClient:
         1. Groups that user's friends are in
         2. Groups with similar course codes to user's current groups
         """
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (me:User {id: $user_id})-[:FRIEND]->(friend)-[:MEMBER_OF]->(g:Group)
-                WHERE NOT (me)-[:MEMBER_OF]->(g)
-                WITH g, COUNT(DISTINCT friend) as friend_count
-                ORDER BY friend_count DESC
-                LIMIT $limit
-                RETURN g.id as group_id, g.name as name,
-                       g.course_code as course_code, friend_count
-                """,
-                user_id=user_id,
-                limit=limit,
-            )
+        records = await self._read(RECOMMEND_GROUPS_QUERY, user_id=user_id, limit=limit)
+        recommendations = [_group_recommendation(record) for record in records]
 
-            recommendations = []
-            async for record in result:
-                recommendations.append(
-                    {
-                        "group_id": record["group_id"],
-                        "name": record["name"],
-                        "course_code": record["course_code"],
-                        "friend_count": record["friend_count"],
-                        "reason": f"{record['friend_count']} friends in this group",
-                    }
-                )
-
-            logger.debug(f"Found {len(recommendations)} group recommendations for user {user_id}")
-            return recommendations
+        logger.debug(f"Found {len(recommendations)} group recommendations for user {user_id}")
+        return recommendations
+
+    async def get_group_candidates(
+        self, user_id: int, min_friends: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Get groups to score for recommendations, with their friend count
+        and whether they share a course prefix with the user's groups
+        """
+        records = await self._read(
+            GROUP_CANDIDATES_QUERY, user_id=user_id, min_friends=min_friends
+        )
+        return [record.data() for record in records]
+
+    async def recommend_all(
+        self, user_id: int, limit: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Friend and group recommendations in one statement, so the pair
+        costs a single Bolt round-trip instead of one per query
+        """
+        records = await self._read(
+            self._recommend_all_query,
+            user_id=user_id,
+            limit=limit,
+            path_limit=limit * RECOMMEND_FRIENDS_PATHS_PER_RESULT,
+        )
+        if not records:
+            return {"friends": [], "groups": []}
+
+        return {
+            "friends": [_friend_recommendation(friend) for friend in records[0]["friends"]],
+            "groups": [_group_recommendation(group) for group in records[0]["groups"]],
+        }
+
+    async def get_friends(self, user_id: int) -> List[Dict[str, Any]]:
+        """Get a user's friends, sorted by full name"""
+        records = await self._read(FRIENDS_QUERY, user_id=user_id)
+        return [record.data() for record in records]
+
+    async def update_user_name(self, user_id: int, full_name: str):
+        """Update the full_name property of a User node"""
+        await self._write(UPDATE_USER_NAME_QUERY, user_id=user_id, full_name=full_name)
+        logger.debug(f"Updated User node name: {user_id}")
 
     async def get_common_groups(self, user1_id: int, user2_id: int) -> List[Dict[str, Any]]:
         """Find groups that both users are members of"""
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (u1:User {id: $user1_id})-[:MEMBER_OF]->(g:Group)<-[:MEMBER_OF]-(u2:User {id: $user2_id})
-                RETURN g.id as group_id, g.name as name, g.course_code as course_code
-                """,
-                user1_id=user1_id,
-                user2_id=user2_id,
-            )
+        records = await self._read(COMMON_GROUPS_QUERY, user1_id=user1_id, user2_id=user2_id)
 
-            groups = []
-            async for record in result:
-                groups.append(
-                    {
-                        "group_id": record["group_id"],
-                        "name": record["name"],
-                        "course_code": record["course_code"],
-                    }
-                )
-            return groups
+        groups = []
+        for record in records:
+            groups.append(
+                {
+                    "group_id": record["group_id"],
+                    "name": record["name"],
+                    "course_code": record["course_code"],
+                }
+            )
+        return groups
 
     async def get_user_degree(self, user_id: int) -> int:
-        """Get number of friends (node degree)"""
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (u:User {id: $user_id})-[:FRIEND]->()
-                RETURN COUNT(*) as degree
-                """,
-                user_id=user_id,
-            )
-            record = await result.single()
-            return record["degree"] if record else 0
+        """
+        Get number of friends (node degree)
+        Reads the degree property maintained by create_friendship(s)
+        """
+        records = await self._read(
+            """
+            MATCH (u:User {id: $user_id})
+            RETURN coalesce(u.degree, 0) as degree
+            """,
+            user_id=user_id,
+        )
+        return records[0]["degree"] if records else 0
+
+    async def backfill_user_degrees(self):
+        """
+        Compute the denormalized degree property for User nodes that lack it
+        (graphs written before degree was maintained on write). A migration
+        step, run by the seed script; nodes that already have it are skipped,
+        since create_friendship(s) sets it from the actual FRIEND edge count
+        """
+        await self._write(
+            """
+            MATCH (u:User)
+            WHERE u.degree IS NULL
+            OPTIONAL MATCH (u)-[:FRIEND]->(friend)
+            WITH u, count(friend) as degree
+            SET u.degree = degree
+            """
+        )
+        logger.info("Backfilled User degree properties")
 
 
 # Global instance
@@ -3,13 +3,78 @@ PostgreSQL Client - System of Record
 Handles transactional data: users, groups, memberships
 """
 import asyncpg
-from typing import Optional, List, Dict, Any
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, List, Dict, Any, Tuple
 import logging
 
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements, prepared once on every pooled connection
+HOT_STATEMENTS = {
+    "create_user": """
+        INSERT INTO users (email, full_name)
+        VALUES ($1, $2)
+        RETURNING id, email, full_name, created_at
+    """,
+    "create_group": """
+        INSERT INTO groups (name, course_code)
+        VALUES ($1, $2)
+        RETURNING id, name, course_code, created_at
+    """,
+    "add_membership": """
+        INSERT INTO group_memberships (user_id, group_id, role)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (user_id, group_id) DO UPDATE SET role = $3
+        RETURNING user_id, group_id, role, joined_at
+    """,
+    "get_user": "SELECT id, email, full_name, created_at FROM users WHERE id = $1",
+    "get_user_by_email": "SELECT id, email, full_name, created_at FROM users WHERE email = $1",
+    "is_member": "SELECT 1 FROM group_memberships WHERE user_id = $1 AND group_id = $2",
+    "get_user_groups": """
+        SELECT g.id, g.name, g.course_code, g.created_at, gm.role, gm.joined_at
+        FROM groups g
+        JOIN group_memberships gm ON g.id = gm.group_id
+        WHERE gm.user_id = $1
+        ORDER BY gm.joined_at DESC
+    """,
+    "search_groups_by_course": """
+        SELECT g.id, g.name, g.course_code, COUNT(gm.user_id) AS member_count
+        FROM groups g
+        LEFT JOIN group_memberships gm ON gm.group_id = g.id
+        WHERE g.course_code LIKE $1
+        GROUP BY g.id
+        ORDER BY g.course_code
+    """,
+    "update_user_name": """
+        UPDATE users SET full_name = $1
+        WHERE id = $2
+        RETURNING id, email, full_name, created_at
+    """,
+}
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching strings that start with prefix (wildcards escaped)"""
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class PreparedConnection(asyncpg.Connection):
+    """Connection that keeps the HOT_STATEMENTS prepared for its lifetime"""
+
+    statements: Dict[str, asyncpg.prepared_stmt.PreparedStatement]
+
+
+# Connection pinned by request_connection() (and transaction()), with the
+# task that owns it. Only that task reuses it: tasks spawned by
+# asyncio.gather inherit the context but must not share one connection.
+_request_conn: ContextVar[Optional[Tuple[asyncio.Task, "PreparedConnection"]]] = ContextVar(
+    "pg_request_conn", default=None
+)
+
 
 class PostgresClient:
     def __init__(self):
@@ -24,80 +89,198 @@ class PostgresClient:
                 database=settings.postgres_db,
                 user=settings.postgres_user,
                 password=settings.postgres_password,
-                min_size=2,
-                max_size=10,
+                # min_size connections are opened (and their statements
+                # prepared) up front, so early requests skip the handshake
+                min_size=settings.postgres_pool_min_size,
+                max_size=settings.postgres_pool_max_size,
+                max_inactive_connection_lifetime=300,
+                command_timeout=30,
+                statement_cache_size=1024,
+                max_cached_statement_lifetime=0,  # keep ad-hoc statements cached
+                connection_class=PreparedConnection,
+                init=self._prepare_statements,
             )
             logger.info("PostgreSQL connection pool created")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise
 
+    @staticmethod
+    async def _prepare_statements(conn: PreparedConnection):
+        """Prepare hot statements once per new connection (Parse/plan up front)"""
+        conn.statements = {
+            name: await conn.prepare(query) for name, query in HOT_STATEMENTS.items()
+        }
+
     async def disconnect(self):
         """Close connection pool"""
         if self.pool:
             await self.pool.close()
             logger.info("PostgreSQL connection pool closed")
 
+    @asynccontextmanager
+    async def request_connection(self) -> AsyncIterator[PreparedConnection]:
+        """Pin one pooled connection for every query made by the current task"""
+        async with self.pool.acquire() as conn:
+            token = _request_conn.set((asyncio.current_task(), conn))
+            try:
+                yield conn
+            finally:
+                _request_conn.reset(token)
+
+    @asynccontextmanager
+    async def transaction(self, synchronous_commit: bool = True) -> AsyncIterator[PreparedConnection]:
+        """
+        Pin one pooled connection to the current task and run every query it
+        makes in a single transaction, committed (once) on exit
+
+        With synchronous_commit=False the commit does not wait for the WAL
+        flush; a crash may lose the transaction but never corrupts data, so
+        this is only for re-runnable bulk loads such as the seed script.
+        """
+        async with self.request_connection() as conn:
+            async with conn.transaction():
+                if not synchronous_commit:
+                    await conn.execute("SET LOCAL synchronous_commit = OFF")
+                yield conn
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PreparedConnection]:
+        """Reuse the connection pinned to this task, else check one out of the pool"""
+        pinned = _request_conn.get()
+        if pinned and pinned[0] is asyncio.current_task():
+            yield pinned[1]
+        else:
+            async with self.pool.acquire() as conn:
+                yield conn
+
     # User operations
     async def create_user(self, email: str, full_name: str) -> Dict[str, Any]:
         """Create a new user"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
+        async with self.acquire() as conn:
+            row = await conn.statements["create_user"].fetchrow(email, full_name)
+            return dict(row)
+
+    async def create_users_bulk(self, users: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Create many users in one statement from (email, full_name) pairs
+        The arrays are bound as two parameters; rows come back in input order
+        """
+        emails, full_names = zip(*users) if users else ((), ())
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
                 """
                 INSERT INTO users (email, full_name)
-                VALUES ($1, $2)
+                SELECT email, full_name
+                FROM unnest($1::text[], $2::text[]) WITH ORDINALITY AS t(email, full_name, ord)
+                ORDER BY ord
                 RETURNING id, email, full_name, created_at
                 """,
-                email,
-                full_name,
+                list(emails),
+                list(full_names),
             )
-            return dict(row)
+            return [dict(row) for row in rows]
+
+    async def copy_users(self, users: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Load many (email, full_name) users with binary COPY, for bulk loads
+        COPY returns no rows, so the new rows are read back by (unique) email
+        on the same connection and returned in input order
+        """
+        if not users:
+            return []
+        async with self.acquire() as conn:
+            await conn.copy_records_to_table(
+                "users", records=users, columns=["email", "full_name"]
+            )
+            rows = await conn.fetch(
+                "SELECT id, email, full_name, created_at FROM users WHERE email = ANY($1::text[])",
+                [email for email, _ in users],
+            )
+        by_email = {row["email"]: dict(row) for row in rows}
+        return [by_email[email] for email, _ in users]
 
     async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT id, email, full_name, created_at FROM users WHERE id = $1",
-                user_id,
-            )
+        async with self.acquire() as conn:
+            row = await conn.statements["get_user"].fetchrow(user_id)
+            return dict(row) if row else None
+
+    async def update_user_name(self, user_id: int, full_name: str) -> Optional[Dict[str, Any]]:
+        """Update a user's full name, returning the updated row"""
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                row = await conn.statements["update_user_name"].fetchrow(full_name, user_id)
             return dict(row) if row else None
 
+    async def get_users_by_ids(self, user_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get many users by ID in one query"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id, email, full_name, created_at FROM users WHERE id = ANY($1::int[])",
+                user_ids,
+            )
+            return [dict(row) for row in rows]
+
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT id, email, full_name, created_at FROM users WHERE email = $1",
-                email,
-            )
+        async with self.acquire() as conn:
+            row = await conn.statements["get_user_by_email"].fetchrow(email)
             return dict(row) if row else None
 
     # Group operations
     async def create_group(self, name: str, course_code: str) -> Dict[str, Any]:
         """Create a new group"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
+        async with self.acquire() as conn:
+            row = await conn.statements["create_group"].fetchrow(name, course_code)
+            return dict(row)
+
+    async def create_groups_bulk(self, groups: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Create many groups in one statement from (name, course_code) pairs, in input order"""
+        names, course_codes = zip(*groups) if groups else ((), ())
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
                 """
                 INSERT INTO groups (name, course_code)
-                VALUES ($1, $2)
+                SELECT name, course_code
+                FROM unnest($1::text[], $2::text[]) WITH ORDINALITY AS t(name, course_code, ord)
+                ORDER BY ord
                 RETURNING id, name, course_code, created_at
                 """,
-                name,
-                course_code,
+                list(names),
+                list(course_codes),
             )
-            return dict(row)
+            return [dict(row) for row in rows]
 
     async def get_group(self, group_id: int) -> Optional[Dict[str, Any]]:
         """Get group by ID"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire() as conn:
             row = await conn.fetchrow(
                 "SELECT id, name, course_code, created_at FROM groups WHERE id = $1",
                 group_id,
             )
             return dict(row) if row else None
 
+    async def get_groups_by_ids(self, group_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get many groups by ID in one query"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id, name, course_code, created_at FROM groups WHERE id = ANY($1::int[])",
+                group_ids,
+            )
+            return [dict(row) for row in rows]
+
+    async def search_groups_by_course(self, course_prefix: str) -> List[Dict[str, Any]]:
+        """Get groups whose course code starts with a prefix, with member counts"""
+        async with self.acquire() as conn:
+            rows = await conn.statements["search_groups_by_course"].fetch(
+                _like_prefix(course_prefix)
+            )
+            return [dict(row) for row in rows]
+
     async def get_groups(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all groups"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire() as conn:
             rows = await conn.fetch(
                 "SELECT id, name, course_code, created_at FROM groups ORDER BY created_at DESC LIMIT $1",
                 limit,
@@ -109,38 +292,62 @@ class PostgresClient:
         self, user_id: int, group_id: int, role: str = "member"
     ) -> Dict[str, Any]:
         """Add user to group"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
+        async with self.acquire() as conn:
+            row = await conn.statements["add_membership"].fetchrow(user_id, group_id, role)
+            return dict(row)
+
+    async def add_memberships_bulk(
+        self, memberships: List[Tuple[int, int, str]]
+    ) -> List[Dict[str, Any]]:
+        """Add many (user_id, group_id, role) memberships in one statement"""
+        user_ids, group_ids, roles = zip(*memberships) if memberships else ((), (), ())
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
                 """
                 INSERT INTO group_memberships (user_id, group_id, role)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (user_id, group_id) DO UPDATE SET role = $3
+                SELECT * FROM unnest($1::int[], $2::int[], $3::text[])
+                ON CONFLICT (user_id, group_id) DO UPDATE SET role = EXCLUDED.role
                 RETURNING user_id, group_id, role, joined_at
                 """,
+                list(user_ids),
+                list(group_ids),
+                list(roles),
+            )
+            return [dict(row) for row in rows]
+
+    async def copy_memberships(self, memberships: List[Tuple[int, int, str]]) -> int:
+        """
+        Load many new (user_id, group_id, role) memberships with binary COPY
+        Unlike add_memberships_bulk an existing membership is an error (no
+        ON CONFLICT); returns the number of rows copied
+        """
+        if not memberships:
+            return 0
+        async with self.acquire() as conn:
+            status = await conn.copy_records_to_table(
+                "group_memberships", records=memberships, columns=["user_id", "group_id", "role"]
+            )
+        return int(status.split()[-1])
+
+    async def remove_membership(self, user_id: int, group_id: int) -> bool:
+        """Remove user from group, returning whether they were a member"""
+        async with self.acquire() as conn:
+            status = await conn.execute(
+                "DELETE FROM group_memberships WHERE user_id = $1 AND group_id = $2",
                 user_id,
                 group_id,
-                role,
             )
-            return dict(row)
+            return status == "DELETE 1"
 
     async def get_user_groups(self, user_id: int) -> List[Dict[str, Any]]:
         """Get all groups for a user"""
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT g.id, g.name, g.course_code, g.created_at, gm.role, gm.joined_at
-                FROM groups g
-                JOIN group_memberships gm ON g.id = gm.group_id
-                WHERE gm.user_id = $1
-                ORDER BY gm.joined_at DESC
-                """,
-                user_id,
-            )
+        async with self.acquire() as conn:
+            rows = await conn.statements["get_user_groups"].fetch(user_id)
             return [dict(row) for row in rows]
 
     async def get_group_members(self, group_id: int) -> List[Dict[str, Any]]:
         """Get all members of a group"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire() as conn:
             rows = await conn.fetch(
                 """
                 SELECT u.id, u.email, u.full_name, gm.role, gm.joined_at
@@ -153,16 +360,30 @@ class PostgresClient:
             )
             return [dict(row) for row in rows]
 
-    async def is_member(self, user_id: int, group_id: int) -> bool:
-        """Check if user is a member of group"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT 1 FROM group_memberships WHERE user_id = $1 AND group_id = $2",
-                user_id,
+    async def get_group_member_ids(self, group_id: int) -> List[int]:
+        """Get the user IDs of all members of a group"""
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT user_id FROM group_memberships WHERE group_id = $1",
+                group_id,
+            )
+            return [row["user_id"] for row in rows]
+
+    async def get_member_count(self, group_id: int) -> int:
+        """Count members of a group without fetching the rows"""
+        async with self.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT COUNT(*) FROM group_memberships WHERE group_id = $1",
                 group_id,
             )
+
+    async def is_member(self, user_id: int, group_id: int) -> bool:
+        """Check if user is a member of group"""
+        async with self.acquire() as conn:
+            row = await conn.statements["is_member"].fetchrow(user_id, group_id)
             return row is not None
 
 
 # Global instance
 postgres_client = PostgresClient()
+
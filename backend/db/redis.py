@@ -3,28 +3,279 @@ Redis Client - Fast Layer
 Handles caching, leaderboards, rate limiting, and recent activity streams
 """
 import redis.asyncio as redis
-import json
-from typing import Optional, List, Dict, Any
+from redis.asyncio.client import Pipeline
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator, Optional, List, Dict, Any
 import logging
 
+import orjson
+
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Connections opened at startup
+REDIS_WARM_CONNECTIONS = 10
+
+
+# Upper bound (approximate) on entries kept per group activity stream
+ACTIVITY_STREAM_MAXLEN = 1000
+
+
+def _activity_key(group_id: int) -> str:
+    return f"activity:group:{group_id}"
+
+
+def _activity(entry_id: bytes, fields: Dict[bytes, bytes]) -> Dict[str, Any]:
+    """Decode a stream entry; its timestamp comes from the <ms>-<seq> entry ID"""
+    activity = _loads(fields[b"data"])
+    activity["timestamp"] = int(entry_id.split(b"-", 1)[0]) / 1000
+    return activity
+
+
+# Fixed-window counter: INCR and set the window TTL on first hit, atomically
+RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
+# SISMEMBER against the member set at the group's current members version
+# (K:ver, 0 when absent); -1 when that set is not cached
+IS_CACHED_MEMBER_SCRIPT = """
+local version = redis.call('GET', KEYS[1] .. ':ver') or '0'
+local key = KEYS[1] .. ':v' .. version
+if redis.call('EXISTS', key) == 0 then
+    return -1
+end
+return redis.call('SISMEMBER', key, ARGV[1])
+"""
+
+# Record a new post: hot-post score from the server clock (TIME, so no
+# client clock skew), group activity entry and author points, atomically.
+# KEYS: hot posts, activity stream, leaderboard
+# ARGV: post id, activity payload, author id, points, stream max length
+RECORD_POST_SCRIPT = """
+local now = redis.call('TIME')
+redis.call('ZADD', KEYS[1], now[1] + now[2] / 1000000, ARGV[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[5], '*', 'data', ARGV[2])
+redis.call('ZINCRBY', KEYS[3], ARGV[4], ARGV[3])
+"""
+
+# For each base key K, GET K:v{current version of K}; the version lives at
+# K:ver (0 when absent). Missing values come back as nil in their slot
+GET_VERSIONED_SCRIPT = """
+local values = {}
+for i, key in ipairs(KEYS) do
+    local version = redis.call('GET', key .. ':ver') or '0'
+    values[i] = redis.call('GET', key .. ':v' .. version)
+end
+return values
+"""
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cache payload; naive datetimes are treated as UTC"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NAIVE_UTC)
+
+
+_loads = orjson.loads
+
+
+class LocalCache:
+    """
+    Small in-process LRU cache with a per-entry TTL, kept in front of Redis
+    for the hottest profile/summary reads. A hit costs a dict lookup instead
+    of a network round-trip; entries written by other workers may be up to
+    ttl seconds stale, which the Redis cache already tolerates for longer
+
+    Values are flat dicts, copied on the way in and out so a caller mutating
+    its result can't change what later readers see. A read-through takes
+    generation(key) before its remote read and passes it to set(), which is
+    skipped if the key was popped (invalidated) in between.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> clock value of its latest pop. Keys without a stamp are at
+        # _floor, the clock value when the table was last reset: a generation
+        # taken before a reset is below it, so its set() is rejected
+        self._popped: Dict[str, int] = {}
+        self._clock = itertools.count(1)
+        self._floor = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return dict(value)
+
+    def generation(self, key: str) -> int:
+        return self._popped.get(key, self._floor)
+
+    def set(self, key: str, value: Dict[str, Any], generation: Optional[int] = None):
+        if generation is not None and generation != self.generation(key):
+            return
+        self._data[key] = (time.monotonic() + self.ttl, dict(value))
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str):
+        self._data.pop(key, None)
+        if len(self._popped) >= self.maxsize:
+            self._reset_generations()
+        self._popped[key] = next(self._clock)
+
+    def clear(self):
+        self._data.clear()
+        self._reset_generations()
+
+    def _reset_generations(self):
+        self._popped.clear()
+        self._floor = next(self._clock)
+
+
+class PointsBatcher:
+    """
+    Coalesces leaderboard increments into periodic pipelined ZINCRBYs
+
+    add() only updates an in-process tally and returns immediately; a
+    background task waits max_wait seconds after the first pending
+    increment, then writes one ZINCRBY per user in a single round-trip.
+    The leaderboard lags by at most max_wait; pending points are flushed
+    on stop(). A failed flush is merged back and retried with the next
+    window, up to max_retries times in a row before it is dropped.
+    """
+
+    def __init__(self, key: str, max_wait: float = 0.1, max_retries: int = 5):
+        self.key = key
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._failures = 0
+        self.client: Optional[redis.Redis] = None
+        self._pending: Dict[int, int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether add() will be flushed; False once stop() has begun"""
+        return self._task is not None and not self._task.done() and not self._closing
+
+    def start(self, client: redis.Redis):
+        """Start the background flush task"""
+        self.client = client
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush pending increments and stop the background task"""
+        if self._task is not None and not self._task.done():
+            # Callers check running and write directly from here on
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+        self._task = None
+
+    def add(self, user_id: int, points: int):
+        """Queue an increment for the next flush"""
+        self._pending[user_id] = self._pending.get(user_id, 0) + points
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            if not self._closing:
+                # Let increments from concurrent requests accumulate
+                await asyncio.sleep(self.max_wait)
+            self._wakeup.clear()
+            await self._flush()
+            if self._closing:
+                # Anything add()ed during the final flush goes out too
+                while self._pending:
+                    await self._flush()
+                return
+
+    async def _flush(self):
+        pending, self._pending = self._pending, {}
+        pending = {user_id: points for user_id, points in pending.items() if points}
+        if not pending:
+            return
+        try:
+            # MULTI/EXEC: a failed flush applied nothing, so retrying can't double count
+            pipe = self.client.pipeline(transaction=True)
+            for user_id, points in pending.items():
+                pipe.zincrby(self.key, points, str(user_id))
+            await pipe.execute()
+        except Exception as e:
+            self._failures += 1
+            if self._failures > self.max_retries or self._closing:
+                logger.error(f"Dropping points for {len(pending)} users after failed flush: {e}")
+                self._failures = 0
+                return
+            logger.warning(f"Flushing points for {len(pending)} users failed, will retry: {e}")
+            # Merge back under anything added meanwhile, and retry next window
+            for user_id, points in pending.items():
+                self._pending[user_id] = self._pending.get(user_id, 0) + points
+            self._wakeup.set()
+            return
+        self._failures = 0
+        logger.debug(f"Flushed points for {len(pending)} users")
+
 
 class RedisClient:
     def __init__(self):
         self.client: Optional[redis.Redis] = None
+        self._rate_limit_script = None
+        self._is_member_script = None
+        self._get_versioned_script = None
+        self._record_post_script = None
+        self._local = LocalCache(settings.local_cache_maxsize, settings.local_cache_ttl)
+        self._points = PointsBatcher("leaderboard:points")
 
     async def connect(self):
         """Initialize Redis connection"""
         try:
-            self.client = redis.Redis(
+            # Blocking pool: concurrent coroutines each get their own
+            # connection, and wait (up to timeout) instead of failing when
+            # all max_connections are busy
+            pool = redis.BlockingConnectionPool(
                 host=settings.redis_host,
                 port=settings.redis_port,
-                decode_responses=True,
+                max_connections=settings.redis_max_connections,
+                timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30,
+                decode_responses=False,
             )
-            await self.client.ping()
+            self.client = redis.Redis(connection_pool=pool)
+            # Concurrent PINGs each open a pooled connection, so the first
+            # requests don't pay for the TCP handshake
+            warm = min(REDIS_WARM_CONNECTIONS, settings.redis_max_connections)
+            await asyncio.gather(*(self.client.ping() for _ in range(warm)))
+            # Scripts run via EVALSHA, reloading automatically on NOSCRIPT
+            self._rate_limit_script = self.client.register_script(RATE_LIMIT_SCRIPT)
+            self._is_member_script = self.client.register_script(IS_CACHED_MEMBER_SCRIPT)
+            self._get_versioned_script = self.client.register_script(GET_VERSIONED_SCRIPT)
+            self._record_post_script = self.client.register_script(RECORD_POST_SCRIPT)
+            # Start coalescing leaderboard increments
+            self._points.start(self.client)
             logger.info("Redis connection established")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
@@ -32,69 +283,268 @@ class RedisClient:
 
     async def disconnect(self):
         """Close Redis connection"""
+        await self._points.stop()
         if self.client:
-            await self.client.close()
+            await self.client.close(close_connection_pool=True)
+            self._local.clear()
             logger.info("Redis connection closed")
 
+    # Pipelining
+    #
+    # Write methods accept an optional pipe. Without one they send their
+    # commands immediately; with one they only queue them, so a caller can
+    # batch several writes into a single round-trip:
+    #
+    #     async with redis_client.pipeline() as pipe:
+    #         await redis_client.add_hot_post(post_id, score, pipe=pipe)
+    #         await redis_client.invalidate_group_cache(group_id, pipe=pipe)
+    #         await pipe.execute()
+    def pipeline(self) -> Pipeline:
+        """Non-transactional pipeline for batching writes into one round-trip"""
+        return self.client.pipeline(transaction=False)
+
+    @asynccontextmanager
+    async def _batch(self, pipe: Optional[Pipeline]) -> AsyncIterator[Pipeline]:
+        """Queue into the caller's pipe, or into a fresh one executed on exit"""
+        if pipe is not None:
+            yield pipe
+            return
+        async with self.pipeline() as own:
+            yield own
+            await own.execute()
+
     # Cache operations
-    async def cache_user(self, user_id: int, user_data: Dict[str, Any], ttl: int = 3600):
+    async def cache_user(
+        self,
+        user_id: int,
+        user_data: Dict[str, Any],
+        ttl: int = 3600,
+        pipe: Optional[Pipeline] = None,
+    ):
         """Cache user profile (1 hour TTL)"""
         key = f"user:{user_id}"
-        await self.client.setex(key, ttl, json.dumps(user_data, default=str))
+        async with self._batch(pipe) as p:
+            p.setex(key, ttl, _dumps(user_data))
+        self._local.set(key, user_data)
         logger.debug(f"Cached user {user_id}")
 
     async def get_cached_user(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Get cached user profile"""
-        key = f"user:{user_id}"
-        data = await self.client.get(key)
-        if data:
-            logger.debug(f"Cache hit for user {user_id}")
-            return json.loads(data)
-        logger.debug(f"Cache miss for user {user_id}")
-        return None
+        """Get cached user profile (in-process cache first, then Redis)"""
+        return await self._get_cached(f"user:{user_id}")
 
-    async def cache_group(self, group_id: int, group_data: Dict[str, Any], ttl: int = 3600):
-        """Cache group summary (1 hour TTL)"""
-        key = f"group:{group_id}"
-        await self.client.setex(key, ttl, json.dumps(group_data, default=str))
-        logger.debug(f"Cached group {group_id}")
+    async def get_cached_users(self, user_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get many cached user profiles with a single MGET (None for misses)"""
+        return await self._get_many_cached("user", user_ids)
+
+    async def cache_users(self, users: Dict[int, Dict[str, Any]], ttl: int = 3600):
+        """Cache many user profiles in one pipelined round-trip"""
+        if not users:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for user_id, user_data in users.items():
+            pipe.setex(f"user:{user_id}", ttl, _dumps(user_data))
+        await pipe.execute()
+        for user_id, user_data in users.items():
+            self._local.set(f"user:{user_id}", user_data)
+        logger.debug(f"Cached {len(users)} users")
+
+    # Group summaries use versioned keys: the value lives at group:{id}:v{ver}
+    # and invalidation is INCR group:{id}:ver. A reader that loaded stale
+    # rows before a concurrent write then caches them under the old version,
+    # which nobody reads again, instead of overwriting the invalidation
+    async def get_group_version(self, group_id: int) -> int:
+        """Current cache version of a group; read it before loading from the database"""
+        version = await self.client.get(f"group:{group_id}:ver")
+        return int(version) if version else 0
+
+    async def cache_group(
+        self,
+        group_id: int,
+        group_data: Dict[str, Any],
+        ttl: int = 3600,
+        version: int = 0,
+        pipe: Optional[Pipeline] = None,
+    ):
+        """Cache group summary under the version it was loaded at (1 hour TTL)"""
+        async with self._batch(pipe) as p:
+            p.setex(f"group:{group_id}:v{version}", ttl, _dumps(group_data))
+        logger.debug(f"Cached group {group_id} at version {version}")
+
+    async def cache_groups(
+        self, groups: Dict[int, Dict[str, Any]], ttl: int = 3600, version: int = 0
+    ):
+        """Cache many group summaries (all at one version) in one pipelined round-trip"""
+        if not groups:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for group_id, group_data in groups.items():
+            pipe.setex(f"group:{group_id}:v{version}", ttl, _dumps(group_data))
+        await pipe.execute()
+        logger.debug(f"Cached {len(groups)} groups at version {version}")
 
     async def get_cached_group(self, group_id: int) -> Optional[Dict[str, Any]]:
-        """Get cached group summary"""
-        key = f"group:{group_id}"
+        """Get cached group summary (in-process cache first, then Redis)"""
+        return (await self.get_cached_groups([group_id]))[group_id]
+
+    async def get_cached_groups(self, group_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Get many cached group summaries in one round-trip (None for misses)
+        Each current version is resolved server-side by GET_VERSIONED_SCRIPT
+        """
+        found = {group_id: self._local.get(f"group:{group_id}") for group_id in group_ids}
+        remote = {
+            group_id: self._local.generation(f"group:{group_id}")
+            for group_id, value in found.items()
+            if value is None
+        }
+        if remote:
+            values = await self._get_versioned_script(
+                keys=[f"group:{group_id}" for group_id in remote]
+            )
+            for (group_id, generation), data in zip(remote.items(), values):
+                if data:
+                    found[group_id] = value = _loads(data)
+                    self._local.set(f"group:{group_id}", value, generation)
+        return found
+
+    async def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read-through: in-process cache, then Redis (hits are kept locally)"""
+        value = self._local.get(key)
+        if value is not None:
+            return value
+        generation = self._local.generation(key)
         data = await self.client.get(key)
         if data:
-            logger.debug(f"Cache hit for group {group_id}")
-            return json.loads(data)
-        logger.debug(f"Cache miss for group {group_id}")
+            logger.debug(f"Cache hit for {key}")
+            value = _loads(data)
+            self._local.set(key, value, generation)
+            return value
+        logger.debug(f"Cache miss for {key}")
         return None
 
-    async def invalidate_user_cache(self, user_id: int):
-        """Invalidate user cache"""
-        key = f"user:{user_id}"
-        await self.client.delete(key)
-        logger.debug(f"Invalidated cache for user {user_id}")
+    async def _get_many_cached(
+        self, prefix: str, ids: List[int]
+    ) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Batched read-through; only ids missing locally go to Redis, in one MGET"""
+        found = {entity_id: self._local.get(f"{prefix}:{entity_id}") for entity_id in ids}
+        remote = {
+            entity_id: self._local.generation(f"{prefix}:{entity_id}")
+            for entity_id, value in found.items()
+            if value is None
+        }
+        if remote:
+            values = await self.client.mget([f"{prefix}:{entity_id}" for entity_id in remote])
+            for (entity_id, generation), data in zip(remote.items(), values):
+                if data:
+                    found[entity_id] = value = _loads(data)
+                    self._local.set(f"{prefix}:{entity_id}", value, generation)
+        return found
+
+    async def invalidate_user_cache(self, *user_ids: int, pipe: Optional[Pipeline] = None):
+        """Invalidate cached profiles for one or more users with a single UNLINK"""
+        keys = [f"user:{user_id}" for user_id in user_ids]
+        for key in keys:
+            self._local.pop(key)
+        async with self._batch(pipe) as p:
+            # UNLINK frees the value on a Redis background thread, unlike DEL
+            p.unlink(*keys)
+        logger.debug(f"Invalidated cache for users {user_ids}")
 
-    async def invalidate_group_cache(self, group_id: int):
-        """Invalidate group cache"""
-        key = f"group:{group_id}"
-        await self.client.delete(key)
+    async def invalidate_group_cache(self, group_id: int, pipe: Optional[Pipeline] = None):
+        """Invalidate group cache by bumping its version (old entries expire by TTL)"""
+        self._local.pop(f"group:{group_id}")
+        async with self._batch(pipe) as p:
+            p.incr(f"group:{group_id}:ver")
         logger.debug(f"Invalidated cache for group {group_id}")
 
+    # Friend lists (short TTL, invalidated when a friendship is created)
+    async def cache_friends(self, user_id: int, friends: List[Dict[str, Any]], ttl: int = 60):
+        """Cache a user's friend list"""
+        key = f"friends:{user_id}"
+        await self.client.setex(key, ttl, _dumps(friends))
+
+    async def get_cached_friends(self, user_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Get cached friend list (None on miss; an empty list is a hit)"""
+        key = f"friends:{user_id}"
+        data = await self.client.get(key)
+        return _loads(data) if data is not None else None
+
+    async def invalidate_friends_cache(self, *user_ids: int, pipe: Optional[Pipeline] = None):
+        """Invalidate friend lists for several users in one round-trip"""
+        async with self._batch(pipe) as p:
+            p.unlink(*(f"friends:{user_id}" for user_id in user_ids))
+        logger.debug(f"Invalidated friend lists for users {user_ids}")
+
+    # Group membership sets are versioned like group summaries: the set lives
+    # at group:{id}:members:v{ver} and joins/leaves INCR group:{id}:members:ver.
+    # A refill loaded before a concurrent join/leave lands under the old
+    # version instead of overwriting the change for the whole TTL
+    async def is_member_cached(self, user_id: int, group_id: int) -> Optional[bool]:
+        """
+        Check membership against the current cached member set in one round-trip
+        Returns None when the group's member set is not cached
+        """
+        result = await self._is_member_script(
+            keys=[f"group:{group_id}:members"], args=[str(user_id)]
+        )
+        if result == -1:
+            return None
+        return bool(result)
+
+    async def get_group_members_version(self, group_id: int) -> int:
+        """Current member set version; read it before loading members from the database"""
+        version = await self.client.get(f"group:{group_id}:members:ver")
+        return int(version) if version else 0
+
+    async def cache_group_members(
+        self, group_id: int, user_ids: List[int], ttl: int = 3600, version: int = 0
+    ):
+        """Cache a group's member set under the version it was loaded at (1 hour TTL)"""
+        if not user_ids:
+            return
+        key = f"group:{group_id}:members:v{version}"
+        pipe = self.client.pipeline(transaction=True)
+        pipe.unlink(key)
+        pipe.sadd(key, *[str(user_id) for user_id in user_ids])
+        pipe.expire(key, ttl)
+        await pipe.execute()
+        logger.debug(f"Cached {len(user_ids)} members for group {group_id} at version {version}")
+
+    async def invalidate_group_members(self, group_id: int, pipe: Optional[Pipeline] = None):
+        """Invalidate the cached member set by bumping its version (old sets expire by TTL)"""
+        async with self._batch(pipe) as p:
+            p.incr(f"group:{group_id}:members:ver")
+        logger.debug(f"Invalidated member set for group {group_id}")
+
     # Leaderboard operations (sorted sets)
-    async def increment_user_points(self, user_id: int, points: int = 1):
-        """Increment user participation points"""
-        await self.client.zincrby("leaderboard:points", points, str(user_id))
+    async def increment_user_points(
+        self, user_id: int, points: int = 1, pipe: Optional[Pipeline] = None
+    ):
+        """
+        Increment user participation points
+        Without a pipe the increment is batched and written within ~100ms
+        """
+        if pipe is None and self._points.running:
+            self._points.add(user_id, points)
+            return
+        async with self._batch(pipe) as p:
+            p.zincrby("leaderboard:points", points, str(user_id))
         logger.debug(f"Incremented points for user {user_id} by {points}")
 
     async def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top users by points (descending)"""
-        results = await self.client.zrevrange(
-            "leaderboard:points", 0, limit - 1, withscores=True
+        # Points are whole numbers, so let redis-py parse scores straight to int
+        results = await self.client.zrange(
+            "leaderboard:points",
+            0,
+            limit - 1,
+            desc=True,
+            withscores=True,
+            score_cast_func=int,
         )
         return [
-            {"user_id": int(user_id), "points": int(score)}
-            for user_id, score in results
+            {"user_id": int(user_id), "points": points}
+            for user_id, points in results
         ]
 
     async def get_user_rank(self, user_id: int) -> Optional[int]:
@@ -102,30 +552,102 @@ class RedisClient:
         rank = await self.client.zrevrank("leaderboard:points", str(user_id))
         return rank
 
-    # Recent activity streams (lists)
-    async def push_activity(self, group_id: int, activity: Dict[str, Any], max_size: int = 100):
-        """Push activity to group's recent stream"""
-        key = f"recent:group:{group_id}"
-        await self.client.lpush(key, json.dumps(activity, default=str))
-        await self.client.ltrim(key, 0, max_size - 1)  # Keep only last N items
+    # Recent activity streams (XADD with approximate MAXLEN trimming)
+    async def push_activity(
+        self,
+        group_id: int,
+        activity: Dict[str, Any],
+        max_size: int = ACTIVITY_STREAM_MAXLEN,
+        pipe: Optional[Pipeline] = None,
+    ):
+        """Append activity to group's stream, capped at roughly max_size entries"""
+        async with self._batch(pipe) as p:
+            p.xadd(
+                _activity_key(group_id),
+                {"data": _dumps(activity)},
+                maxlen=max_size,
+                approximate=True,  # MAXLEN ~ trims whole nodes, near free
+            )
         logger.debug(f"Pushed activity to group {group_id}")
 
     async def get_recent_activity(self, group_id: int, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get recent activity for a group"""
-        key = f"recent:group:{group_id}"
-        activities = await self.client.lrange(key, 0, limit - 1)
-        return [json.loads(activity) for activity in activities]
+        """Get recent activity for a group (XREVRANGE + - COUNT limit)"""
+        entries = await self.client.xrevrange(_activity_key(group_id), count=limit)
+        return [_activity(entry_id, fields) for entry_id, fields in entries]
+
+    async def get_recent_activities(
+        self, group_ids: List[int], limit: int = 20
+    ) -> List[Iterator[Dict[str, Any]]]:
+        """
+        Get recent activity for several groups in one round-trip (pipelined XREVRANGE)
+        Returns one newest-first stream per group; entries are decoded lazily
+        """
+        if not group_ids:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for group_id in group_ids:
+            pipe.xrevrange(_activity_key(group_id), count=limit)
+        results = await pipe.execute()
+        return [
+            (_activity(entry_id, fields) for entry_id, fields in entries)
+            for entries in results
+        ]
+
+    async def get_recent_activity_count(self, group_id: int) -> int:
+        """Get number of entries in a group's activity stream"""
+        return await self.client.xlen(_activity_key(group_id))
+
+    async def have_recent_activity(self, group_ids: List[int]) -> List[bool]:
+        """Check which groups have a non-empty activity stream (pipelined EXISTS)"""
+        if not group_ids:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for group_id in group_ids:
+            pipe.exists(_activity_key(group_id))
+        return [bool(exists) for exists in await pipe.execute()]
 
     # Hot posts (sorted sets with timestamp scores)
-    async def add_hot_post(self, post_id: str, score: float):
+    async def add_hot_post(self, post_id: str, score: float, pipe: Optional[Pipeline] = None):
         """Add post to hot posts sorted set"""
-        await self.client.zadd("hot:posts", {post_id: score})
+        async with self._batch(pipe) as p:
+            p.zadd("hot:posts", {post_id: score})
         logger.debug(f"Added post {post_id} to hot posts with score {score}")
 
+    async def record_post(
+        self,
+        post_id: str,
+        group_id: int,
+        author_id: int,
+        activity: Dict[str, Any],
+        points: int = 10,
+        max_size: int = ACTIVITY_STREAM_MAXLEN,
+        pipe: Optional[Pipeline] = None,
+    ):
+        """
+        Add a new post to hot posts (scored by the Redis server clock), push its
+        group activity and award the author points, in one atomic script call
+        """
+        async with self._batch(pipe) as p:
+            await self._record_post_script(
+                keys=["hot:posts", _activity_key(group_id), "leaderboard:points"],
+                args=[post_id, _dumps(activity), str(author_id), points, max_size],
+                client=p,
+            )
+        logger.debug(f"Recorded post {post_id} in group {group_id}")
+
+    async def remove_hot_post(self, post_id: str, author_id: int, points: int = 0):
+        """Drop a post from hot posts and deduct its points in one round-trip"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrem("hot:posts", post_id)
+        if points:
+            pipe.zincrby("leaderboard:points", -points, str(author_id))
+        await pipe.execute()
+        logger.debug(f"Removed post {post_id} from hot posts")
+
     async def get_hot_posts(self, limit: int = 10) -> List[str]:
         """Get hot posts (most recent/highest scored)"""
         post_ids = await self.client.zrevrange("hot:posts", 0, limit - 1)
-        return list(post_ids)
+        return [post_id.decode() for post_id in post_ids]
 
     # Rate limiting (simple counter with TTL)
     async def check_rate_limit(
@@ -136,18 +658,12 @@ class RedisClient:
         Returns True if allowed, False if rate limited
         """
         key = f"ratelimit:user:{user_id}"
-        current = await self.client.get(key)
-
-        if current is None:
-            # First request in window
-            await self.client.setex(key, window_seconds, 1)
-            return True
+        current = await self._rate_limit_script(keys=[key], args=[window_seconds])
 
-        if int(current) >= max_requests:
+        if current > max_requests:
             logger.warning(f"Rate limit exceeded for user {user_id}")
             return False
 
-        await self.client.incr(key)
         return True
 
 
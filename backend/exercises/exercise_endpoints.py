@@ -4,19 +4,37 @@ Complete the TODO sections to implement missing endpoints
 """
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
+import asyncio
+import heapq
+import logging
+from itertools import islice
+from bson import ObjectId
 
+from backend.config import settings
 from backend.db.postgres import postgres_client
 from backend.db.redis import redis_client
 from backend.db.mongo import mongo_client
 from backend.db.neo4j import neo4j_client
+from backend.services.group_service import group_service
+from backend.services.user_service import user_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/exercises", tags=["exercises"])
 
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks = set()
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
 
 # ============================================================================
 # EXERCISE 1: Get User's Friends List (10 points)
 # ============================================================================
-# TODO: EXERCISE 1
 # Implement an endpoint that returns all friends of a user
 #
 # Requirements:
@@ -36,23 +54,27 @@ router = APIRouter(prefix="/exercises", tags=["exercises"])
 @router.get("/users/{user_id}/friends")
 async def get_user_friends(user_id: int) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 1 - Get all friends of a user
+    EXERCISE 1 - Get all friends of a user
 
     Steps:
     1. Query Neo4j for users connected via FRIEND relationship
     2. Return list of friends with user_id, full_name, email
     3. Sort results alphabetically by full_name
 
-    Hint: Use neo4j_client.driver.session() and run a Cypher query
+    The user id is passed as a query parameter (never formatted into the
+    Cypher text) so Neo4j reuses one cached plan for every user.
+    Friend lists are cached in Redis for 60s and invalidated by add_friend.
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 1 not implemented")
+    friends = await redis_client.get_cached_friends(user_id)
+    if friends is None:
+        friends = await neo4j_client.get_friends(user_id)
+        await redis_client.cache_friends(user_id, friends)
+    return friends
 
 
 # ============================================================================
 # EXERCISE 2: Create a Comment on a Post (10 points)
 # ============================================================================
-# TODO: EXERCISE 2
 # Implement an endpoint to add a comment to a post
 #
 # Requirements:
@@ -68,24 +90,68 @@ async def get_user_friends(user_id: int) -> List[Dict[str, Any]]:
 @router.post("/posts/{post_id}/comments")
 async def create_comment(post_id: str, comment_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    TODO: EXERCISE 2 - Create a comment on a post
+    EXERCISE 2 - Create a comment on a post
 
     Steps:
-    1. Verify the post exists in MongoDB using mongo_client.get_post()
-    2. Create the comment using mongo_client.create_comment()
-    3. Award 2 points to the author using redis_client.increment_user_points()
+    1. Look up the author (cached) for the denormalized author_name
+    2. Concurrently, one round-trip on the critical path:
+       - verify the post exists in MongoDB
+       - create the comment using mongo_client.create_comment()
+       - award 2 points to the author using redis_client.increment_user_points()
+    3. If the post turned out not to exist, or any step failed, undo
+       whichever writes succeeded and return 404 (or re-raise)
     4. Return the created comment
 
-    Hint: Check backend/services/post_service.py for patterns
+    Comments on missing posts are rare, so the happy path doesn't wait for
+    the existence check before writing; the rare miss pays for compensation.
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 2 not implemented")
+    author_id = comment_data.get("author_id")
+    body = comment_data.get("body")
+    if author_id is None or not body:
+        raise HTTPException(status_code=400, detail="author_id and body are required")
+    if not ObjectId.is_valid(post_id):
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    author = await user_service.get_user(author_id)
+
+    points = 2
+    exists, comment, awarded = await asyncio.gather(
+        mongo_client.post_exists(post_id),
+        mongo_client.create_comment(
+            post_id, author_id, body, author_name=author["full_name"] if author else None
+        ),
+        redis_client.increment_user_points(author_id, points=points),
+        return_exceptions=True,
+    )
+    error = next(
+        (r for r in (exists, comment, awarded) if isinstance(r, BaseException)), None
+    )
+
+    if error is not None or not exists:
+        undo = []
+        if not isinstance(comment, BaseException):
+            undo.append(mongo_client.delete_comment(comment["_id"]))
+        if not isinstance(awarded, BaseException):
+            undo.append(redis_client.increment_user_points(author_id, points=-points))
+        for result in await asyncio.gather(*undo, return_exceptions=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Undoing comment on post {post_id} failed: {result}")
+        if error is not None:
+            raise error
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    return {
+        "id": comment["_id"],
+        "post_id": comment["post_id"],
+        "author_id": comment["author_id"],
+        "body": comment["body"],
+        "created_at": comment["created_at"],
+    }
 
 
 # ============================================================================
 # EXERCISE 3: Get Groups by Course Code (10 points)
 # ============================================================================
-# TODO: EXERCISE 3
 # Implement an endpoint to search groups by course code
 #
 # Requirements:
@@ -105,23 +171,21 @@ async def create_comment(post_id: str, comment_data: Dict[str, Any]) -> Dict[str
 @router.get("/groups/search")
 async def search_groups_by_course(course_code: str) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 3 - Search groups by course code
+    EXERCISE 3 - Search groups by course code
 
     Steps:
     1. Query PostgreSQL for groups where course_code starts with the given prefix
-    2. For each group, count members from group_memberships table
+    2. Count members per group in the same query (LEFT JOIN + GROUP BY)
     3. Return list of groups with member counts
 
-    Hint: Use postgres_client.pool.acquire() and conn.fetch() with LIKE query
+    One round-trip instead of 1 + N per-group COUNT queries.
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 3 not implemented")
+    return await postgres_client.search_groups_by_course(course_code)
 
 
 # ============================================================================
 # EXERCISE 4: Get User's Recent Activity (10 points)
 # ============================================================================
-# TODO: EXERCISE 4
 # Implement an endpoint to get a user's recent activity across all groups
 #
 # Requirements:
@@ -140,24 +204,28 @@ async def search_groups_by_course(course_code: str) -> List[Dict[str, Any]]:
 @router.get("/users/{user_id}/activity")
 async def get_user_recent_activity(user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 4 - Get user's recent activity
+    EXERCISE 4 - Get user's recent activity
 
     Steps:
     1. Get all groups the user is a member of using postgres_client.get_user_groups()
-    2. For each group, get recent activity using redis_client.get_recent_activity()
-    3. Combine all activities and sort by timestamp (descending)
-    4. Return the most recent 'limit' activities
+    2. Get recent activity for all groups in one pipelined Redis round-trip
+    3. Merge the per-group lists by timestamp (descending), keep 'limit'
 
-    Hint: Use Python's sorted() function with a lambda key
+    Each group's stream is already newest-first (XREVRANGE), so a k-way
+    heapq.merge yields the overall newest entries without sorting, and
+    only the entries actually taken get decoded.
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 4 not implemented")
+    groups = await postgres_client.get_user_groups(user_id)
+    streams = await redis_client.get_recent_activities(
+        [group["id"] for group in groups], limit
+    )
+    merged = heapq.merge(*streams, key=lambda a: a["timestamp"], reverse=True)
+    return list(islice(merged, limit))
 
 
 # ============================================================================
 # EXERCISE 5: Get Common Groups Between Two Users (10 points)
 # ============================================================================
-# TODO: EXERCISE 5
 # Implement an endpoint to find groups that two users are both members of
 #
 # Requirements:
@@ -175,22 +243,18 @@ async def get_user_recent_activity(user_id: int, limit: int = 20) -> List[Dict[s
 @router.get("/users/{user1_id}/common-groups/{user2_id}")
 async def get_common_groups(user1_id: int, user2_id: int) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 5 - Find common groups between two users
+    EXERCISE 5 - Find common groups between two users
 
     Steps:
     1. Use Neo4j to query for groups both users are members of
     2. Return list of common groups
-
-    Hint: The neo4j_client already has a get_common_groups() method!
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 5 not implemented")
+    return await neo4j_client.get_common_groups(user1_id, user2_id)
 
 
 # ============================================================================
 # EXERCISE 6: Cache Invalidation (10 points)
 # ============================================================================
-# TODO: EXERCISE 6
 # Implement an endpoint to update a user's full name
 #
 # Requirements:
@@ -203,27 +267,85 @@ async def get_common_groups(user1_id: int, user2_id: int) -> List[Dict[str, Any]
 # Request body: {"full_name": "Alice Johnson-Smith"}
 # Expected response: {"id": 1, "email": "...", "full_name": "Alice Johnson-Smith", ...}
 
+USER_CACHE_REINVALIDATE_DELAY = 0.5  # seconds
+AUTHOR_NAME_REFRESH_ATTEMPTS = 3
+
+
+async def _refresh_after_rename(user_id: int, delay: float):
+    """Invalidate the user cache and refresh author_name copies, with retries"""
+    for attempt in range(1, AUTHOR_NAME_REFRESH_ATTEMPTS + 1):
+        try:
+            await redis_client.invalidate_user_cache(user_id)
+            user = await postgres_client.get_user(user_id)
+            if user:
+                await mongo_client.update_author_name(user_id, user["full_name"])
+            return
+        except Exception as e:
+            logger.warning(
+                f"Refreshing user {user_id} after rename failed "
+                f"(attempt {attempt}/{AUTHOR_NAME_REFRESH_ATTEMPTS}): {e}"
+            )
+            await asyncio.sleep(delay * attempt)
+    logger.error(f"Giving up refreshing user {user_id} after rename; copies are stale")
+
+
+async def _after_user_rename(user_id: int, delay: float):
+    """
+    Second half of the double-delete, then refresh the denormalized author_name
+
+    Running the refresh after the delay also catches a post created with the
+    pre-rename name while we were writing. Other workers may serve the old
+    name from their in-process cache for up to local_cache_ttl, so a second
+    pass runs once that has expired. The name is re-read from PostgreSQL so
+    that, of two overlapping renames, the last committed one wins.
+    """
+    await asyncio.sleep(delay)
+    await _refresh_after_rename(user_id, delay)
+    await asyncio.sleep(settings.local_cache_ttl)
+    await _refresh_after_rename(user_id, delay)
+
+
 @router.put("/users/{user_id}/name")
 async def update_user_name(user_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    TODO: EXERCISE 6 - Update user name with cache invalidation
+    EXERCISE 6 - Update user name with cache invalidation
 
     Steps:
-    1. Update full_name in PostgreSQL using SQL UPDATE
-    2. Invalidate Redis cache using redis_client.invalidate_user_cache()
-    3. Update Neo4j node using Cypher: SET u.full_name = $new_name
-    4. Return the updated user from PostgreSQL
+    1. Invalidate Redis cache using redis_client.invalidate_user_cache()
+    2. Update full_name in PostgreSQL (in a transaction)
+    3. Update Neo4j node using Cypher: SET u.full_name = $full_name
+    4. After a short delay (background): invalidate again (double-delete),
+       then refresh author_name copies on posts/comments in MongoDB; repeat
+       once other workers' in-process caches have expired
+    5. Return the updated user from PostgreSQL
+
+    Invalidating first means a failure part-way through never leaves the old
+    name cached. The delayed second delete catches a reader that missed the
+    cache and repopulated it with the pre-update row while we were writing.
 
     This demonstrates the write-through pattern with cache invalidation
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 6 not implemented")
+    full_name = update_data.get("full_name")
+    if not full_name:
+        raise HTTPException(status_code=400, detail="full_name is required")
+
+    await redis_client.invalidate_user_cache(user_id)
+
+    user = await postgres_client.update_user_name(user_id, full_name)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await neo4j_client.update_user_name(user_id, full_name)
+
+    # Renames are rare: the denormalized author_name is refreshed off the request path
+    _spawn(_after_user_rename(user_id, USER_CACHE_REINVALIDATE_DELAY))
+
+    return user
 
 
 # ============================================================================
 # EXERCISE 7: Aggregate Query (10 points)
 # ============================================================================
-# TODO: EXERCISE 7
 # Implement an endpoint to get statistics for a group
 #
 # Requirements:
@@ -246,25 +368,44 @@ async def update_user_name(user_id: int, update_data: Dict[str, Any]) -> Dict[st
 @router.get("/groups/{group_id}/stats")
 async def get_group_statistics(group_id: int) -> Dict[str, Any]:
     """
-    TODO: EXERCISE 7 - Get comprehensive group statistics
+    EXERCISE 7 - Get comprehensive group statistics
 
     Steps:
     1. Get group from PostgreSQL (or Redis cache)
     2. Count posts using mongo_client.get_post_count()
-    3. Count members using postgres_client.get_group_members()
+    3. Count members using postgres_client.get_member_count()
     4. Get recent activity count from Redis
     5. Combine all stats into a single response
 
+    The four lookups are independent, so they run concurrently with
+    asyncio.gather: latency is the slowest lookup, not the sum of all four.
+    Each call takes its own pool connection / command, so they don't
+    contend for a single connection.
+
     This demonstrates aggregating data from multiple databases
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 7 not implemented")
+    group, total_posts, total_members, recent_activity_count = await asyncio.gather(
+        group_service.get_group(group_id),
+        mongo_client.get_post_count(group_id),
+        postgres_client.get_member_count(group_id),
+        redis_client.get_recent_activity_count(group_id),
+    )
+
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    return {
+        "group_id": group_id,
+        "name": group["name"],
+        "total_members": total_members,
+        "total_posts": total_posts,
+        "recent_activity_count": recent_activity_count,
+    }
 
 
 # ============================================================================
 # EXERCISE 8: Graph Traversal (10 points)
 # ============================================================================
-# TODO: EXERCISE 8
 # Implement an endpoint for "second-degree groups"
 #
 # Requirements:
@@ -284,26 +425,33 @@ async def get_group_statistics(group_id: int) -> Dict[str, Any]:
 @router.get("/users/{user_id}/second-degree-groups")
 async def get_second_degree_groups(user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 8 - Find groups via friends (2nd degree connections)
+    EXERCISE 8 - Find groups via friends (2nd degree connections)
 
     Steps:
-    1. Write a Cypher query to find groups where:
-       - User's friends are members
-       - User is NOT a member
+    1. Find groups where the user's friends are members and the user is not
     2. Count how many friends are in each group
     3. Sort by friend count (descending)
     4. Return top 'limit' groups
 
+    Counting, sorting and limiting all happen inside the parameterized
+    RECOMMEND_GROUPS_QUERY, so only the top 'limit' rows cross the wire.
+
     This demonstrates advanced graph traversal patterns
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 8 not implemented")
+    groups = await neo4j_client.recommend_groups(user_id, limit)
+    return [
+        {
+            "group_id": group["group_id"],
+            "name": group["name"],
+            "friend_count": group["friend_count"],
+        }
+        for group in groups
+    ]
 
 
 # ============================================================================
 # EXERCISE 9: Batch Operations (10 points)
 # ============================================================================
-# TODO: EXERCISE 9
 # Implement an endpoint to delete a post
 #
 # Requirements:
@@ -320,27 +468,42 @@ async def get_second_degree_groups(user_id: int, limit: int = 10) -> List[Dict[s
 @router.delete("/posts/{post_id}")
 async def delete_post(post_id: str) -> Dict[str, Any]:
     """
-    TODO: EXERCISE 9 - Delete a post with cleanup across databases
+    EXERCISE 9 - Delete a post with cleanup across databases
 
     Steps:
     1. Get the post from MongoDB to know the author
-    2. Count comments on the post
-    3. Delete all comments for this post
-    4. Delete the post itself
-    5. Remove from Redis hot posts (ZREM)
-    6. Deduct 10 points from author's leaderboard
-    7. Return summary of what was deleted
+    2. Delete the post itself; only the request that actually deleted it
+       continues (a concurrent DELETE of the same post gets 404)
+    3. Concurrently:
+       - delete all comments (delete_many reports the count, no separate count query)
+       - remove from Redis hot posts and deduct 10 points (one pipeline)
+    4. Return summary of what was deleted
 
     This demonstrates coordinated deletes across multiple databases
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 9 not implemented")
+    post = await mongo_client.get_post(post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    if not await mongo_client.delete_post(post["_id"]):
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    points = 10
+    comments_deleted, _ = await asyncio.gather(
+        mongo_client.delete_post_comments(post["_id"]),
+        redis_client.remove_hot_post(post["_id"], post["author_id"], points),
+    )
+
+    return {
+        "message": "Post deleted",
+        "comments_deleted": comments_deleted,
+        "points_deducted": points,
+    }
 
 
 # ============================================================================
 # EXERCISE 10: Complex Recommendation (15 points - BONUS)
 # ============================================================================
-# TODO: EXERCISE 10 (BONUS)
 # Implement a smart group recommendation algorithm
 #
 # Requirements:
@@ -355,18 +518,22 @@ async def delete_post(post_id: str) -> Dict[str, Any]:
 #
 # This is a challenging exercise that requires combining data from all 4 databases!
 
+# Friends in a group only count as a signal from this many up
+SMART_REC_MIN_FRIENDS = 2
+
+
 @router.get("/users/{user_id}/smart-recommendations")
 async def get_smart_group_recommendations(user_id: int) -> List[Dict[str, Any]]:
     """
-    TODO: EXERCISE 10 - Smart group recommendations (BONUS)
+    EXERCISE 10 - Smart group recommendations (BONUS)
 
     Steps:
-    1. Get groups via friends from Neo4j (score: friend_count * 3)
-    2. Get user's current groups from PostgreSQL
-    3. Find groups with matching course prefixes (score: +2)
-    4. Check Redis activity for each group (score: +1 if active)
-    5. Combine scores and rank groups
-    6. Return top 5 with explanations
+    1. Get candidate groups from Neo4j in one traversal: friend counts
+       (score: friend_count * 3, only with SMART_REC_MIN_FRIENDS+ friends)
+       and course prefix match against the user's own groups (score: +2)
+    2. Check Redis activity for all candidates in one pipeline (score: +1 if active)
+    3. Combine scores and rank groups
+    4. Return top 5 with explanations
 
     Expected response:
     [
@@ -380,5 +547,33 @@ async def get_smart_group_recommendations(user_id: int) -> List[Dict[str, Any]]:
 
     This demonstrates real-world recommendation system patterns!
     """
-    # YOUR CODE HERE
-    raise HTTPException(status_code=501, detail="Exercise 10 (BONUS) not implemented")
+    candidates = await neo4j_client.get_group_candidates(
+        user_id, min_friends=SMART_REC_MIN_FRIENDS
+    )
+    active = await redis_client.have_recent_activity(
+        [group["group_id"] for group in candidates]
+    )
+
+    recommendations = []
+    for group, is_active in zip(candidates, active):
+        score = 0
+        reasons = []
+        if group["friend_count"] >= SMART_REC_MIN_FRIENDS:
+            score += group["friend_count"] * 3
+            reasons.append(f"{group['friend_count']} friends")
+        if group["course_match"]:
+            score += 2
+            reasons.append("matching course")
+        if is_active:
+            score += 1
+            reasons.append("recently active")
+        recommendations.append(
+            {
+                "group_id": group["group_id"],
+                "name": group["name"],
+                "score": score,
+                "reasons": reasons,
+            }
+        )
+
+    return heapq.nlargest(5, recommendations, key=lambda r: r["score"])
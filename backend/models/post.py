@@ -1,7 +1,7 @@
 """
 Post-related Pydantic models
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -52,3 +52,10 @@ class LeaderboardEntry(BaseModel):
     full_name: Optional[str] = None
     points: int
     rank: Optional[int] = None
+
+
+# List adapters for the large list responses: validate and serialize to
+# JSON in a single pydantic-core pass, skipping FastAPI's per-item
+# model -> dict -> jsonable_encoder round trip
+PostFeedAdapter = TypeAdapter(List[PostWithAuthor])
+LeaderboardAdapter = TypeAdapter(List[LeaderboardEntry])
@@ -60,6 +60,21 @@ async def join_group(group_id: int, request: JoinGroupRequest) -> Dict[str, Any]
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.delete("/{group_id}/members/{user_id}")
+async def leave_group(group_id: int, user_id: int) -> Dict[str, Any]:
+    """
+    Leave a study group
+    - Deletes membership from PostgreSQL
+    - Deletes MEMBER_OF relationship in Neo4j
+    - Evicts the user from the cached member set
+    - Invalidates group cache
+    """
+    try:
+        return await group_service.leave_group(user_id=user_id, group_id=group_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/{group_id}/members")
 async def get_group_members(group_id: int) -> List[Dict[str, Any]]:
     """Get all members of a group from PostgreSQL"""
@@ -2,9 +2,11 @@
 Post endpoints
 """
 from fastapi import APIRouter, HTTPException, status
-from typing import List, Dict, Any
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Dict, Any, AsyncIterator
+import orjson
 
-from backend.models.post import PostCreate, PostWithAuthor
+from backend.models.post import PostCreate, PostWithAuthor, PostFeedAdapter
 from backend.services.post_service import post_service
 
 router = APIRouter(prefix="/groups/{group_id}/posts", tags=["posts"])
@@ -37,7 +39,7 @@ async def create_post(group_id: int, post_data: PostCreate) -> Dict[str, Any]:
 
 
 @router.get("/feed", response_model=List[PostWithAuthor])
-async def get_group_feed(group_id: int, limit: int = 20, skip: int = 0) -> List[Dict[str, Any]]:
+async def get_group_feed(group_id: int, limit: int = 20, skip: int = 0) -> Response:
     """
     Get feed for a group
     - Reads posts from MongoDB
@@ -47,4 +49,22 @@ async def get_group_feed(group_id: int, limit: int = 20, skip: int = 0) -> List[
     Demonstrates cross-database query enrichment
     """
     posts = await post_service.get_group_feed(group_id, limit, skip)
-    return posts
+    return Response(
+        PostFeedAdapter.dump_json(PostFeedAdapter.validate_python(posts)),
+        media_type="application/json",
+    )
+
+
+@router.get("/stream")
+async def stream_group_posts(group_id: int) -> StreamingResponse:
+    """
+    Stream all posts in a group as NDJSON (one JSON document per line)
+    - Reads posts from MongoDB in cursor batches
+    - Memory stays bounded regardless of how many posts the group has
+    """
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for post in post_service.stream_group_posts(group_id):
+            yield orjson.dumps(post) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
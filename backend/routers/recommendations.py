@@ -2,11 +2,12 @@
 Recommendation endpoints
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from typing import List, Dict, Any
 
 from backend.models.user import FriendRecommendation
 from backend.models.group import GroupRecommendation
-from backend.models.post import LeaderboardEntry
+from backend.models.post import LeaderboardEntry, LeaderboardAdapter
 from backend.services.recommendation_service import recommendation_service
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
@@ -58,8 +59,20 @@ async def recommend_groups(user_id: int, limit: int = 10) -> List[Dict[str, Any]
     return recommendations
 
 
+@router.get("/users/{user_id}", response_model=Dict[str, List[Dict[str, Any]]])
+async def recommend_all(user_id: int, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Friend and group recommendations in one call
+
+    Both Neo4j queries run as subqueries of one Cypher statement, so the
+    "Discover" panel costs one Bolt round-trip instead of two requests
+    """
+    recommendations = await recommendation_service.recommend_all(user_id, limit)
+    return recommendations
+
+
 @router.get("/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard(limit: int = 10) -> List[Dict[str, Any]]:
+async def get_leaderboard(limit: int = 10) -> Response:
     """
     Get participation leaderboard
 
@@ -76,4 +89,7 @@ async def get_leaderboard(limit: int = 10) -> List[Dict[str, Any]]:
     - UPDATE + ORDER BY + LIMIT: O(N log N) where N is total users
     """
     leaderboard = await recommendation_service.get_leaderboard(limit)
-    return leaderboard
+    return Response(
+        LeaderboardAdapter.dump_json(LeaderboardAdapter.validate_python(leaderboard)),
+        media_type="application/json",
+    )
@@ -1,9 +1,9 @@
 """
 Group Service - Coordinates group operations across databases
 """
+import asyncio
 import logging
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
 
 from backend.db.postgres import postgres_client
 from backend.db.redis import redis_client
@@ -22,6 +22,10 @@ class GroupService:
     - MongoDB: post counts
     """
 
+    def __init__(self):
+        # group_id -> in-flight PostgreSQL load, for single-flight cache misses
+        self._inflight: Dict[int, asyncio.Future] = {}
+
     async def create_group(self, name: str, course_code: str) -> Dict[str, Any]:
         """
         Create group in PostgreSQL, mirror to Neo4j, cache summary in Redis
@@ -30,15 +34,16 @@ class GroupService:
         group = await postgres_client.create_group(name, course_code)
         logger.info(f"Created group {group['id']} in PostgreSQL")
 
-        # 2. Create node in Neo4j for graph queries
-        await neo4j_client.create_group_node(
-            group_id=group["id"], name=group["name"], course_code=group["course_code"]
-        )
-        logger.info(f"Created group node {group['id']} in Neo4j")
-
-        # 3. Cache in Redis
+        # 2. Create node in Neo4j for graph queries and cache in Redis,
+        #    concurrently since both only need the new id
         group_summary = {**group, "member_count": 0, "post_count": 0}
-        await redis_client.cache_group(group["id"], group_summary)
+        await asyncio.gather(
+            neo4j_client.create_group_node(
+                group_id=group["id"], name=group["name"], course_code=group["course_code"]
+            ),
+            redis_client.cache_group(group["id"], group_summary),
+        )
+        logger.info(f"Created group node {group['id']} in Neo4j and cached in Redis")
 
         return group
 
@@ -52,25 +57,40 @@ class GroupService:
             logger.info(f"Cache hit for group {group_id}")
             return cached_group
 
-        # Cache miss - get from PostgreSQL and enrich
+        # Cache miss - concurrent misses for the same id share one load
+        load = self._inflight.get(group_id)
+        if load is None:
+            load = asyncio.ensure_future(self._load_group(group_id))
+            self._inflight[group_id] = load
+            load.add_done_callback(lambda _: self._inflight.pop(group_id, None))
+        # Shielded so a cancelled caller doesn't cancel the load for the others
+        return await asyncio.shield(load)
+
+    async def _load_group(self, group_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch from PostgreSQL, enrich with counts and repopulate the cache"""
         logger.info(f"Cache miss for group {group_id}, fetching from PostgreSQL")
+        # Version first: if a write invalidates while we load, our (possibly
+        # stale) summary lands under the superseded version
+        version = await redis_client.get_group_version(group_id)
         group = await postgres_client.get_group(group_id)
 
         if not group:
             return None
 
-        # Enrich with counts
-        members = await postgres_client.get_group_members(group_id)
-        post_count = await mongo_client.get_post_count(group_id)
+        # Enrich with counts from PostgreSQL and MongoDB concurrently
+        member_count, post_count = await asyncio.gather(
+            postgres_client.get_member_count(group_id),
+            mongo_client.get_post_count(group_id),
+        )
 
         group_summary = {
             **group,
-            "member_count": len(members),
+            "member_count": member_count,
             "post_count": post_count,
         }
 
         # Cache the enriched data
-        await redis_client.cache_group(group_id, group_summary)
+        await redis_client.cache_group(group_id, group_summary, version=version)
 
         return group_summary
 
@@ -87,27 +107,66 @@ class GroupService:
         membership = await postgres_client.add_membership(user_id, group_id, role)
         logger.info(f"Added user {user_id} to group {group_id} in PostgreSQL")
 
-        # 2. Create MEMBER_OF relationship in Neo4j
-        await neo4j_client.create_membership(user_id, group_id, role)
-        logger.info(f"Created MEMBER_OF relationship in Neo4j")
-
-        # 3. Push activity to Redis stream
+        # 2. Fan out the dependent writes concurrently once the membership
+        #    row exists:
+        #    - MEMBER_OF relationship in Neo4j
+        #    - the Redis side effects, in one pipelined round-trip
         activity = {
             "type": "join",
             "user_id": user_id,
             "group_id": group_id,
-            "timestamp": datetime.utcnow().isoformat(),
         }
-        await redis_client.push_activity(group_id, activity)
-        logger.info(f"Pushed join activity to Redis stream for group {group_id}")
+        await asyncio.gather(
+            neo4j_client.create_membership(user_id, group_id, role),
+            self._record_join(user_id, group_id, activity),
+        )
+        logger.info(f"Propagated membership {user_id} -> {group_id} to Neo4j and Redis")
 
-        # 4. Invalidate group cache (member_count changed)
-        await redis_client.invalidate_group_cache(group_id)
+        return membership
 
-        # 5. Award points for participation
+    async def _record_join(self, user_id: int, group_id: int, activity: Dict[str, Any]):
+        """
+        Redis side effects of a join, pipelined into one round-trip:
+        - join activity on the group stream
+        - group cache invalidation (member_count changed)
+        - member set invalidation
+        Participation points go through the batched leaderboard writer
+        """
+        async with redis_client.pipeline() as pipe:
+            await redis_client.push_activity(group_id, activity, pipe=pipe)
+            await redis_client.invalidate_group_cache(group_id, pipe=pipe)
+            await redis_client.invalidate_group_members(group_id, pipe=pipe)
+            await pipe.execute()
         await redis_client.increment_user_points(user_id, points=5)
 
-        return membership
+    async def leave_group(self, user_id: int, group_id: int) -> Dict[str, Any]:
+        """
+        Remove user from group across databases:
+        1. PostgreSQL: delete membership record
+        2. Neo4j: delete MEMBER_OF relationship
+        3. Redis: invalidate the cached member set and group cache
+        """
+        # 1. Delete membership in PostgreSQL
+        removed = await postgres_client.remove_membership(user_id, group_id)
+        if not removed:
+            raise ValueError(f"User {user_id} is not a member of group {group_id}")
+        logger.info(f"Removed user {user_id} from group {group_id} in PostgreSQL")
+
+        # 2. Propagate to Neo4j and Redis concurrently
+        await asyncio.gather(
+            neo4j_client.remove_membership(user_id, group_id),
+            self._record_leave(user_id, group_id),
+        )
+        logger.info(f"Propagated membership removal {user_id} -> {group_id} to Neo4j and Redis")
+
+        return {"user_id": user_id, "group_id": group_id, "status": "left"}
+
+    async def _record_leave(self, user_id: int, group_id: int):
+        """Invalidate the cached member set and the group, in one round-trip"""
+        async with redis_client.pipeline() as pipe:
+            await redis_client.invalidate_group_members(group_id, pipe=pipe)
+            await redis_client.invalidate_group_cache(group_id, pipe=pipe)
+            await pipe.execute()
 
     async def get_group_members(self, group_id: int) -> List[Dict[str, Any]]:
         """Get all members of a group from PostgreSQL"""
@@ -1,17 +1,21 @@
 """
 Post Service - Handles content operations via MongoDB with Redis caching
 """
+import asyncio
 import logging
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, AsyncIterator
 import time
 
-from backend.db.mongo import mongo_client
+from backend.db.mongo import mongo_client, POST_FEED_PROJECTION
 from backend.db.postgres import postgres_client
 from backend.db.redis import redis_client
+from backend.services.user_service import user_service, UNKNOWN_USER
 
 logger = logging.getLogger(__name__)
 
+# Stand-in for groups that no longer exist
+UNKNOWN_GROUP = {"name": "Unknown Group"}
+
 
 class PostService:
     """
@@ -21,6 +25,22 @@ class PostService:
     - Redis: hot posts cache and activity streams
     """
 
+    async def _is_member(self, user_id: int, group_id: int) -> bool:
+        """
+        Membership check via the Redis member set (SISMEMBER)
+        On a miss, load the group's members from PostgreSQL and cache them
+        """
+        is_member = await redis_client.is_member_cached(user_id, group_id)
+        if is_member is not None:
+            return is_member
+
+        # Version first: if a join/leave lands while we load, our (possibly
+        # stale) set is cached under the superseded version
+        version = await redis_client.get_group_members_version(group_id)
+        member_ids = await postgres_client.get_group_member_ids(group_id)
+        await redis_client.cache_group_members(group_id, member_ids, version=version)
+        return user_id in member_ids
+
     async def create_post(
         self,
         author_id: int,
@@ -33,12 +53,16 @@ class PostService:
         """
         Create post in MongoDB, update Redis hot posts and activity
         """
-        # Verify user is member of group
-        is_member = await postgres_client.is_member(author_id, group_id)
+        # Verify user is member of group, and look up the author whose name
+        # is stored on the post
+        is_member, author = await asyncio.gather(
+            self._is_member(author_id, group_id),
+            user_service.get_user(author_id),
+        )
         if not is_member:
             raise ValueError("User is not a member of this group")
 
-        # 1. Create post in MongoDB
+        # 1. Create post in MongoDB, author name/email denormalized
         post = await mongo_client.create_post(
             author_id=author_id,
             group_id=group_id,
@@ -46,33 +70,48 @@ class PostService:
             title=title,
             body=body,
             tags=tags or [],
+            author_name=author["full_name"] if author else None,
+            author_email=author["email"] if author else None,
         )
         logger.info(f"Created post {post['_id']} in MongoDB")
 
-        # 2. Add to hot posts in Redis (score = timestamp for recency)
+        # 2. Redis side effects, pipelined into one round-trip:
+        #    - hot posts (score = timestamp for recency)
+        #    - group activity stream
+        #    - group cache invalidation (post_count changed)
         timestamp_score = time.time()
-        await redis_client.add_hot_post(post["_id"], timestamp_score)
-        logger.info(f"Added post {post['_id']} to hot posts")
-
-        # 3. Push to group activity stream
         activity = {
             "type": "post",
             "post_id": post["_id"],
             "author_id": author_id,
             "group_id": group_id,
             "title": title,
-            "timestamp": datetime.utcnow().isoformat(),
         }
-        await redis_client.push_activity(group_id, activity)
+        async with redis_client.pipeline() as pipe:
+            await redis_client.add_hot_post(post["_id"], timestamp_score, pipe=pipe)
+            await redis_client.push_activity(group_id, activity, pipe=pipe)
+            await redis_client.invalidate_group_cache(group_id, pipe=pipe)
+            await pipe.execute()
 
-        # 4. Award points for creating content
+        # 3. Award points for creating content (batched leaderboard write)
         await redis_client.increment_user_points(author_id, points=10)
-
-        # 5. Invalidate group cache (post_count changed)
-        await redis_client.invalidate_group_cache(group_id)
+        logger.info(f"Added post {post['_id']} to hot posts and group {group_id} activity")
 
         return post
 
+    async def _get_groups(self, group_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Groups by id from the Redis summary cache, PostgreSQL for misses
+        Misses aren't cached back: summaries carry counts a bare row lacks
+        """
+        cached = await redis_client.get_cached_groups(group_ids)
+        groups = {group_id: group for group_id, group in cached.items() if group}
+        missing = [group_id for group_id, group in cached.items() if not group]
+        if missing:
+            for group in await postgres_client.get_groups_by_ids(missing):
+                groups[group["id"]] = group
+        return groups
+
     async def get_group_feed(
         self, group_id: int, limit: int = 20, skip: int = 0
     ) -> List[Dict[str, Any]]:
@@ -84,29 +123,43 @@ class PostService:
 
         Demonstrates cross-database enrichment pattern
         """
-        # 1. Get posts from MongoDB
-        posts = await mongo_client.get_group_posts(group_id, limit, skip)
+        # 1. Get posts from MongoDB (only the fields the feed renders)
+        posts = await mongo_client.get_group_posts(
+            group_id, limit, skip, projection=POST_FEED_PROJECTION
+        )
         logger.info(f"Retrieved {len(posts)} posts from MongoDB for group {group_id}")
 
-        # 2. Enrich with author and group data
-        enriched_posts = []
-        for post in posts:
-            # Get author info (cache-aside via Redis)
-            author = await postgres_client.get_user(post["author_id"])
-
-            # Get group info (cache-aside via Redis)
-            group = await postgres_client.get_group(post["group_id"])
+        # 2. Resolve groups, and authors of posts that predate the
+        #    denormalized author fields, in bulk and concurrently: each is
+        #    one Redis MGET plus one PostgreSQL query for the misses
+        groups, authors = await asyncio.gather(
+            self._get_groups(list({post["group_id"] for post in posts})),
+            user_service.get_users(
+                [post["author_id"] for post in posts if not post.get("author_name")]
+            ),
+        )
 
-            enriched_post = {
+        # 3. Enrich with author and group data; unknown ids resolve to
+        #    placeholder records, so there's no per-field None check
+        return [
+            {
                 **post,
                 "id": post["_id"],  # Rename _id to id for response model
-                "author_name": author["full_name"] if author else "Unknown",
-                "author_email": author["email"] if author else "unknown@example.com",
-                "group_name": group["name"] if group else "Unknown Group",
+                "author_name": post.get("author_name") or author["full_name"],
+                "author_email": post.get("author_email") or author["email"],
+                "group_name": groups.get(post["group_id"], UNKNOWN_GROUP)["name"],
             }
-            enriched_posts.append(enriched_post)
+            for post in posts
+            for author in (authors.get(post["author_id"], UNKNOWN_USER),)
+        ]
 
-        return enriched_posts
+    async def stream_group_posts(self, group_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every post in a group from MongoDB, newest first
+        Posts are yielded as cursor batches arrive instead of building a list
+        """
+        async for post in mongo_client.iter_group_posts(group_id):
+            yield post
 
     async def get_hot_posts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -117,23 +170,20 @@ class PostService:
         hot_post_ids = await redis_client.get_hot_posts(limit)
         logger.info(f"Retrieved {len(hot_post_ids)} hot post IDs from Redis")
 
-        # 2. Fetch full post data from MongoDB
-        enriched_posts = []
-        for post_id in hot_post_ids:
-            post = await mongo_client.get_post(post_id)
-            if post:
-                # Enrich with author data
-                author = await postgres_client.get_user(post["author_id"])
-                post["author_name"] = author["full_name"] if author else "Unknown"
-                enriched_posts.append(post)
+        # 2. Fetch full post data from MongoDB in one $in query
+        posts = await mongo_client.get_posts_by_ids(hot_post_ids)
 
-        return enriched_posts
+        # 3. Author names are stored on the posts; older posts get one batched lookup
+        return await self._fill_author_names(posts)
 
     async def create_comment(
         self, post_id: str, author_id: int, body: str
     ) -> Dict[str, Any]:
-        """Create comment in MongoDB and award points"""
-        comment = await mongo_client.create_comment(post_id, author_id, body)
+        """Create comment in MongoDB, storing the author's name on it, and award points"""
+        author = await user_service.get_user(author_id)
+        comment = await mongo_client.create_comment(
+            post_id, author_id, body, author_name=author["full_name"] if author else None
+        )
 
         # Award points for engagement
         await redis_client.increment_user_points(author_id, points=2)
@@ -141,17 +191,21 @@ class PostService:
         return comment
 
     async def get_post_comments(self, post_id: str) -> List[Dict[str, Any]]:
-        """Get comments with author enrichment"""
+        """Get comments; author names are stored on them at creation"""
         comments = await mongo_client.get_post_comments(post_id)
+        return await self._fill_author_names(comments)
 
-        # Enrich with author names
-        enriched_comments = []
-        for comment in comments:
-            author = await postgres_client.get_user(comment["author_id"])
-            comment["author_name"] = author["full_name"] if author else "Unknown"
-            enriched_comments.append(comment)
-
-        return enriched_comments
+    async def _fill_author_names(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Posts/comments written before author_name was denormalized get it
+        looked up, in one batch; everything else is returned as stored
+        """
+        legacy = [doc for doc in docs if not doc.get("author_name")]
+        if legacy:
+            authors = await user_service.get_users([doc["author_id"] for doc in legacy])
+            for doc in legacy:
+                doc["author_name"] = authors.get(doc["author_id"], UNKNOWN_USER)["full_name"]
+        return docs
 
 
 # Global instance
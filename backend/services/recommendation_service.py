@@ -5,7 +5,8 @@ import logging
 from typing import List, Dict, Any
 
 from backend.db.neo4j import neo4j_client
-from backend.db.postgres import postgres_client
+from backend.db.redis import redis_client
+from backend.services.user_service import user_service, UNKNOWN_USER
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,20 @@ class RecommendationService:
         logger.info(f"Found {len(recommendations)} group recommendations for user {user_id}")
         return recommendations
 
+    async def recommend_all(
+        self, user_id: int, limit: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Friend and group recommendations for the "Discover" panel
+        Both graph queries run as one Cypher statement (one round-trip)
+        """
+        recommendations = await neo4j_client.recommend_all(user_id, limit)
+        logger.info(
+            f"Found {len(recommendations['friends'])} friend and "
+            f"{len(recommendations['groups'])} group recommendations for user {user_id}"
+        )
+        return recommendations
+
     async def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get participation leaderboard from Redis
@@ -58,23 +73,21 @@ class RecommendationService:
         Demonstrates Redis sorted sets for leaderboard use case
         Much faster than SQL ORDER BY with LIMIT
         """
-        from backend.db.redis import redis_client
-
-        # Get top scorers from Redis (O(log N) operation)
+        # Get top scorers from Redis (one ZREVRANGE ... WITHSCORES, O(log N + limit))
         leaderboard = await redis_client.get_leaderboard(limit)
 
-        # Enrich with user data from PostgreSQL
-        enriched = []
-        for idx, entry in enumerate(leaderboard):
-            user = await postgres_client.get_user(entry["user_id"])
-            enriched.append(
-                {
-                    "rank": idx + 1,
-                    "user_id": entry["user_id"],
-                    "full_name": user["full_name"] if user else "Unknown",
-                    "points": entry["points"],
-                }
-            )
+        # Enrich with user data: one MGET, plus one PostgreSQL query for misses
+        users = await user_service.get_users([entry["user_id"] for entry in leaderboard])
+
+        enriched = [
+            {
+                "rank": rank,
+                "user_id": entry["user_id"],
+                "full_name": users.get(entry["user_id"], UNKNOWN_USER)["full_name"],
+                "points": entry["points"],
+            }
+            for rank, entry in enumerate(leaderboard, start=1)
+        ]
 
         return enriched
 
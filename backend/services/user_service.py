@@ -2,8 +2,9 @@
 User Service - Coordinates user operations across multiple databases
 Demonstrates polyglot persistence pattern for user data
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, List, Dict, Any
 
 from backend.db.postgres import postgres_client
 from backend.db.redis import redis_client
@@ -11,6 +12,10 @@ from backend.db.neo4j import neo4j_client
 
 logger = logging.getLogger(__name__)
 
+# Stand-in for users that no longer exist, used as the default when enriching
+# content with author data
+UNKNOWN_USER = {"full_name": "Unknown", "email": "unknown@example.com"}
+
 
 class UserService:
     """
@@ -20,6 +25,10 @@ class UserService:
     - Redis: cached user profiles
     """
 
+    def __init__(self):
+        # user_id -> in-flight PostgreSQL load, for single-flight cache misses
+        self._inflight: Dict[int, asyncio.Future] = {}
+
     async def create_user(self, email: str, full_name: str) -> Dict[str, Any]:
         """
         Create user in PostgreSQL, mirror to Neo4j, cache in Redis
@@ -29,15 +38,15 @@ class UserService:
         user = await postgres_client.create_user(email, full_name)
         logger.info(f"Created user {user['id']} in PostgreSQL")
 
-        # 2. Create corresponding node in Neo4j for relationship queries
-        await neo4j_client.create_user_node(
-            user_id=user["id"], email=user["email"], full_name=user["full_name"]
+        # 2. Mirror to Neo4j for relationship queries and cache the profile
+        #    in Redis. Both only need the new id, so they run concurrently
+        await asyncio.gather(
+            neo4j_client.create_user_node(
+                user_id=user["id"], email=user["email"], full_name=user["full_name"]
+            ),
+            redis_client.cache_user(user["id"], user),
         )
-        logger.info(f"Created user node {user['id']} in Neo4j")
-
-        # 3. Cache profile in Redis
-        await redis_client.cache_user(user["id"], user)
-        logger.info(f"Cached user {user['id']} in Redis")
+        logger.info(f"Created user node {user['id']} in Neo4j and cached in Redis")
 
         return user
 
@@ -54,7 +63,17 @@ class UserService:
             logger.info(f"Cache hit for user {user_id}")
             return cached_user
 
-        # Cache miss - get from PostgreSQL
+        # Cache miss - concurrent misses for the same id share one load
+        load = self._inflight.get(user_id)
+        if load is None:
+            load = asyncio.ensure_future(self._load_user(user_id))
+            self._inflight[user_id] = load
+            load.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        # Shielded so a cancelled caller doesn't cancel the load for the others
+        return await asyncio.shield(load)
+
+    async def _load_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch from PostgreSQL and repopulate the cache"""
         logger.info(f"Cache miss for user {user_id}, fetching from PostgreSQL")
         user = await postgres_client.get_user(user_id)
 
@@ -64,6 +83,26 @@ class UserService:
 
         return user
 
+    async def get_users(self, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Batched cache-aside lookup for many users:
+        1. One Redis MGET for all ids
+        2. One PostgreSQL query for the misses
+        3. Repopulate cache for the misses in one pipeline
+        Unknown ids are absent from the result
+        """
+        cached = await redis_client.get_cached_users(list(dict.fromkeys(user_ids)))
+        users = {user_id: user for user_id, user in cached.items() if user}
+
+        missing = [user_id for user_id, user in cached.items() if not user]
+        if missing:
+            logger.info(f"Cache miss for {len(missing)} users, fetching from PostgreSQL")
+            fetched = {user["id"]: user for user in await postgres_client.get_users_by_ids(missing)}
+            await redis_client.cache_users(fetched)
+            users.update(fetched)
+
+        return users
+
     async def get_user_profile(self, user_id: int) -> Optional[Dict[str, Any]]:
         """
         Get enriched user profile:
@@ -75,9 +114,11 @@ class UserService:
         if not user:
             return None
 
-        # Enrich with graph data
-        friend_count = await neo4j_client.get_user_degree(user_id)
-        groups = await postgres_client.get_user_groups(user_id)
+        # Enrich with graph degree and memberships (independent, so concurrent)
+        friend_count, groups = await asyncio.gather(
+            neo4j_client.get_user_degree(user_id),
+            postgres_client.get_user_groups(user_id),
+        )
 
         profile = {
             **user,
@@ -93,15 +134,16 @@ class UserService:
         Create friendship relationship in Neo4j graph
         This is purely a graph operation - no PostgreSQL involvement
         """
-        # Verify both users exist in PostgreSQL
-        user1 = await postgres_client.get_user(user1_id)
-        user2 = await postgres_client.get_user(user2_id)
+        # Verify both users exist (one PostgreSQL query) and check the graph
+        # for an existing friendship, concurrently
+        found, are_friends = await asyncio.gather(
+            postgres_client.get_users_by_ids([user1_id, user2_id]),
+            neo4j_client.are_friends(user1_id, user2_id),
+        )
 
-        if not user1 or not user2:
+        if len({user["id"] for user in found}) != len({user1_id, user2_id}):
             raise ValueError("One or both users do not exist")
 
-        # Check if already friends
-        are_friends = await neo4j_client.are_friends(user1_id, user2_id)
         if are_friends:
             raise ValueError("Users are already friends")
 
@@ -109,9 +151,11 @@ class UserService:
         await neo4j_client.create_friendship(user1_id, user2_id)
         logger.info(f"Created friendship: {user1_id} <-> {user2_id}")
 
-        # Invalidate user caches since friend_count changed
-        await redis_client.invalidate_user_cache(user1_id)
-        await redis_client.invalidate_user_cache(user2_id)
+        # Invalidate user caches since friend_count changed, in one round-trip
+        async with redis_client.pipeline() as pipe:
+            await redis_client.invalidate_user_cache(user1_id, user2_id, pipe=pipe)
+            await redis_client.invalidate_friends_cache(user1_id, user2_id, pipe=pipe)
+            await pipe.execute()
 
         return {
             "user1_id": user1_id,
@@ -2,10 +2,30 @@
 Unit tests for CampusConnect services
 Demonstrates testing polyglot persistence patterns
 """
+import asyncio
+from contextlib import asynccontextmanager
+
+import fakeredis
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 
+@asynccontextmanager
+async def connected_redis_client():
+    """A RedisClient connected (scripts registered, batcher running) to fakeredis"""
+    from backend.db.redis import RedisClient
+
+    fake = fakeredis.FakeAsyncRedis()
+    client = RedisClient()
+    with patch("backend.db.redis.redis.BlockingConnectionPool"), \
+         patch("backend.db.redis.redis.Redis", return_value=fake):
+        await client.connect()
+    try:
+        yield client, fake
+    finally:
+        await client.disconnect()
+
+
 class TestUserService:
     """Test user service operations across PostgreSQL, Neo4j, and Redis"""
 
@@ -39,12 +59,13 @@ class TestUserService:
             # Execute
             result = await service.create_user("test@example.com", "Test User")
 
-            # Assert all three databases were written to
-            mock_pg.create_user.assert_called_once_with("test@example.com", "Test User")
-            mock_neo4j.create_user_node.assert_called_once_with(
+            # Assert all three databases were written to (Neo4j and Redis
+            # run concurrently, so only completion is checked, not order)
+            mock_pg.create_user.assert_awaited_once_with("test@example.com", "Test User")
+            mock_neo4j.create_user_node.assert_awaited_once_with(
                 user_id=1, email="test@example.com", full_name="Test User"
             )
-            mock_redis.cache_user.assert_called_once_with(1, mock_user)
+            mock_redis.cache_user.assert_awaited_once_with(1, mock_user)
             assert result == mock_user
 
     @pytest.mark.asyncio
@@ -80,6 +101,89 @@ class TestUserService:
             assert result == mock_user
 
 
+    @pytest.mark.asyncio
+    async def test_concurrent_cache_misses_share_one_database_read(self):
+        """
+        Test single-flight on cache miss: concurrent lookups of the same
+        uncached user issue only one PostgreSQL query
+        """
+        import asyncio
+        from backend.services.user_service import UserService
+
+        service = UserService()
+
+        with patch("backend.services.user_service.postgres_client") as mock_pg, \
+             patch("backend.services.user_service.redis_client") as mock_redis:
+
+            mock_user = {"id": 1, "email": "test@example.com", "full_name": "Test User"}
+            mock_redis.get_cached_user = AsyncMock(return_value=None)
+            mock_pg.get_user = AsyncMock(return_value=mock_user)
+            mock_redis.cache_user = AsyncMock()
+
+            # Execute
+            results = await asyncio.gather(*(service.get_user(1) for _ in range(5)))
+
+            # Assert one load served every caller
+            mock_pg.get_user.assert_awaited_once_with(1)
+            mock_redis.cache_user.assert_awaited_once_with(1, mock_user)
+            assert results == [mock_user] * 5
+            assert not service._inflight
+
+    @pytest.mark.asyncio
+    async def test_get_users_batches_cache_reads_and_backfills_misses(self):
+        """
+        Test batched cache-aside:
+        1. One Redis MGET for all ids
+        2. One PostgreSQL query for only the misses
+        3. Misses written back to Redis in one call
+        """
+        from backend.services.user_service import UserService
+
+        service = UserService()
+
+        with patch("backend.services.user_service.postgres_client") as mock_pg, \
+             patch("backend.services.user_service.redis_client") as mock_redis:
+
+            cached_user = {"id": 1, "email": "a@example.com", "full_name": "Cached"}
+            fetched_user = {"id": 2, "email": "b@example.com", "full_name": "Fetched"}
+            mock_redis.get_cached_users = AsyncMock(return_value={1: cached_user, 2: None})
+            mock_pg.get_users_by_ids = AsyncMock(return_value=[fetched_user])
+            mock_redis.cache_users = AsyncMock()
+
+            # Execute (duplicate ids are looked up once)
+            result = await service.get_users([1, 2, 1])
+
+            mock_redis.get_cached_users.assert_awaited_once_with([1, 2])
+            mock_pg.get_users_by_ids.assert_awaited_once_with([2])
+            mock_redis.cache_users.assert_awaited_once_with({2: fetched_user})
+            assert result == {1: cached_user, 2: fetched_user}
+
+    @pytest.mark.asyncio
+    async def test_add_friend_rejects_unknown_user_with_one_lookup(self):
+        """
+        Test that add_friend checks both users with a single batched
+        PostgreSQL query and writes nothing when one is missing
+        """
+        from backend.services.user_service import UserService
+
+        service = UserService()
+
+        with patch("backend.services.user_service.postgres_client") as mock_pg, \
+             patch("backend.services.user_service.neo4j_client") as mock_neo4j, \
+             patch("backend.services.user_service.redis_client") as mock_redis:
+
+            mock_pg.get_users_by_ids = AsyncMock(return_value=[{"id": 1}])
+            mock_neo4j.are_friends = AsyncMock(return_value=False)
+            mock_neo4j.create_friendship = AsyncMock()
+
+            with pytest.raises(ValueError):
+                await service.add_friend(1, 2)
+
+            mock_pg.get_users_by_ids.assert_awaited_once_with([1, 2])
+            mock_neo4j.create_friendship.assert_not_awaited()
+            mock_redis.pipeline.assert_not_called()
+
+
 class TestGroupService:
     """Test group service multi-database coordination"""
 
@@ -103,22 +207,63 @@ class TestGroupService:
             mock_membership = {"user_id": 1, "group_id": 1, "role": "member"}
             mock_pg.add_membership = AsyncMock(return_value=mock_membership)
             mock_neo4j.create_membership = AsyncMock()
+            pipe = MagicMock()
+            pipe.execute = AsyncMock()
+            mock_redis.pipeline.return_value.__aenter__.return_value = pipe
             mock_redis.push_activity = AsyncMock()
             mock_redis.invalidate_group_cache = AsyncMock()
+            mock_redis.invalidate_group_members = AsyncMock()
             mock_redis.increment_user_points = AsyncMock()
 
             # Execute
             result = await service.join_group(1, 1, "member")
 
-            # Assert all operations occurred
-            mock_pg.add_membership.assert_called_once()
-            mock_neo4j.create_membership.assert_called_once()
-            mock_redis.push_activity.assert_called_once()
-            mock_redis.invalidate_group_cache.assert_called_once_with(1)
-            mock_redis.increment_user_points.assert_called_once_with(1, points=5)
+            # Assert all operations completed (the fan-out after PostgreSQL
+            # is concurrent, so order isn't checked)
+            mock_pg.add_membership.assert_awaited_once()
+            mock_neo4j.create_membership.assert_awaited_once_with(1, 1, "member")
+            mock_redis.push_activity.assert_awaited_once()
+            mock_redis.invalidate_group_cache.assert_awaited_once_with(1, pipe=pipe)
+            mock_redis.invalidate_group_members.assert_awaited_once_with(1, pipe=pipe)
+            mock_redis.increment_user_points.assert_awaited_once_with(1, points=5)
+            # Assert the Redis writes went out in a single pipeline
+            pipe.execute.assert_awaited_once()
             assert result == mock_membership
 
 
+    @pytest.mark.asyncio
+    async def test_leave_group_invalidates_member_set(self):
+        """
+        Test that leaving a group:
+        1. Deletes the PostgreSQL membership
+        2. Deletes the Neo4j MEMBER_OF relationship
+        3. Invalidates the Redis member set (version bump)
+        """
+        from backend.services.group_service import GroupService
+
+        service = GroupService()
+
+        with patch("backend.services.group_service.postgres_client") as mock_pg, \
+             patch("backend.services.group_service.neo4j_client") as mock_neo4j, \
+             patch("backend.services.group_service.redis_client") as mock_redis:
+
+            mock_pg.remove_membership = AsyncMock(return_value=True)
+            mock_neo4j.remove_membership = AsyncMock()
+            pipe = MagicMock()
+            pipe.execute = AsyncMock()
+            mock_redis.pipeline.return_value.__aenter__.return_value = pipe
+            mock_redis.invalidate_group_members = AsyncMock()
+            mock_redis.invalidate_group_cache = AsyncMock()
+
+            await service.leave_group(1, 2)
+
+            mock_pg.remove_membership.assert_awaited_once_with(1, 2)
+            mock_neo4j.remove_membership.assert_awaited_once_with(1, 2)
+            mock_redis.invalidate_group_members.assert_awaited_once_with(2, pipe=pipe)
+            mock_redis.invalidate_group_cache.assert_awaited_once_with(2, pipe=pipe)
+            pipe.execute.assert_awaited_once()
+
+
 class TestPostService:
     """Test post service MongoDB + Redis operations"""
 
@@ -137,12 +282,19 @@ class TestPostService:
 
         with patch("backend.services.post_service.mongo_client") as mock_mongo, \
              patch("backend.services.post_service.postgres_client") as mock_pg, \
-             patch("backend.services.post_service.redis_client") as mock_redis:
+             patch("backend.services.post_service.redis_client") as mock_redis, \
+             patch("backend.services.post_service.user_service") as mock_users:
 
             # Setup mocks
-            mock_pg.is_member = AsyncMock(return_value=True)
+            mock_redis.is_member_cached = AsyncMock(return_value=True)
+            mock_users.get_user = AsyncMock(
+                return_value={"id": 1, "full_name": "Author 1", "email": "author1@test.com"}
+            )
             mock_post = {"_id": "post123", "title": "Test Post"}
             mock_mongo.create_post = AsyncMock(return_value=mock_post)
+            pipe = MagicMock()
+            pipe.execute = AsyncMock()
+            mock_redis.pipeline.return_value.__aenter__.return_value = pipe
             mock_redis.add_hot_post = AsyncMock()
             mock_redis.push_activity = AsyncMock()
             mock_redis.increment_user_points = AsyncMock()
@@ -157,33 +309,88 @@ class TestPostService:
                 body="Test body",
             )
 
-            # Assert MongoDB write
+            # Assert membership was answered from the Redis member set
+            mock_redis.is_member_cached.assert_called_once_with(1, 1)
+            # Assert MongoDB write, with the author denormalized onto the post
             mock_mongo.create_post.assert_called_once()
+            assert mock_mongo.create_post.call_args.kwargs["author_name"] == "Author 1"
+            assert mock_mongo.create_post.call_args.kwargs["author_email"] == "author1@test.com"
             # Assert Redis operations
             mock_redis.add_hot_post.assert_called_once()
             mock_redis.push_activity.assert_called_once()
             mock_redis.increment_user_points.assert_called_once_with(1, points=10)
+            mock_redis.invalidate_group_cache.assert_called_once_with(1, pipe=pipe)
+            # Assert the pipelined Redis writes shared one round-trip
+            pipe.execute.assert_awaited_once()
             assert result == mock_post
 
+    @pytest.mark.asyncio
+    async def test_create_post_rejects_non_member_after_cache_miss(self):
+        """
+        Test that on a membership cache miss:
+        1. Group members are loaded from PostgreSQL
+        2. The Redis member set is repopulated under the version read first
+        3. Non-members are rejected without writing to MongoDB
+        """
+        from backend.services.post_service import PostService
+
+        service = PostService()
+
+        with patch("backend.services.post_service.mongo_client") as mock_mongo, \
+             patch("backend.services.post_service.postgres_client") as mock_pg, \
+             patch("backend.services.post_service.redis_client") as mock_redis, \
+             patch("backend.services.post_service.user_service") as mock_users:
+
+            mock_redis.is_member_cached = AsyncMock(return_value=None)
+            mock_users.get_user = AsyncMock(return_value=None)
+            mock_pg.get_group_member_ids = AsyncMock(return_value=[2, 3])
+            mock_redis.get_group_members_version = AsyncMock(return_value=3)
+            mock_redis.cache_group_members = AsyncMock()
+            mock_mongo.create_post = AsyncMock()
+
+            with pytest.raises(ValueError):
+                await service.create_post(
+                    author_id=1,
+                    group_id=1,
+                    post_type="note",
+                    title="Test Post",
+                    body="Test body",
+                )
+
+            mock_pg.get_group_member_ids.assert_called_once_with(1)
+            mock_redis.cache_group_members.assert_called_once_with(1, [2, 3], version=3)
+            mock_mongo.create_post.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_group_feed_enriches_from_multiple_sources(self):
         """
         Test that feed retrieval:
         1. Gets posts from MongoDB
-        2. Enriches with author data from PostgreSQL
-        3. Enriches with group data from PostgreSQL
+        2. Enriches with author data in one batched lookup
+        3. Enriches with group data from Redis, falling back to PostgreSQL
         """
         from backend.services.post_service import PostService
 
         service = PostService()
 
         with patch("backend.services.post_service.mongo_client") as mock_mongo, \
-             patch("backend.services.post_service.postgres_client") as mock_pg:
+             patch("backend.services.post_service.postgres_client") as mock_pg, \
+             patch("backend.services.post_service.redis_client") as mock_redis, \
+             patch("backend.services.user_service.postgres_client") as mock_users_pg, \
+             patch("backend.services.user_service.redis_client") as mock_users_redis:
 
-            # Setup mocks
+            # Setup mocks (post 3 already carries its denormalized author)
             mock_posts = [
                 {"_id": "1", "author_id": 1, "group_id": 1, "title": "Post 1"},
                 {"_id": "2", "author_id": 2, "group_id": 1, "title": "Post 2"},
+                {
+                    "_id": "3",
+                    "author_id": 3,
+                    "group_id": 1,
+                    "title": "Post 3",
+                    "author_name": "Author 3",
+                    "author_email": "author3@test.com",
+                },
             ]
             mock_mongo.get_group_posts = AsyncMock(return_value=mock_posts)
 
@@ -191,16 +398,29 @@ class TestPostService:
             mock_author2 = {"full_name": "Author 2", "email": "author2@test.com"}
             mock_group = {"name": "Test Group"}
 
-            mock_pg.get_user = AsyncMock(side_effect=[mock_author1, mock_author2])
-            mock_pg.get_group = AsyncMock(return_value=mock_group)
+            mock_users_redis.get_cached_users = AsyncMock(return_value={1: None, 2: None})
+            mock_users_redis.cache_users = AsyncMock()
+            mock_users_pg.get_users_by_ids = AsyncMock(
+                return_value=[{"id": 1, **mock_author1}, {"id": 2, **mock_author2}]
+            )
+            mock_redis.get_cached_groups = AsyncMock(return_value={1: None})
+            mock_pg.get_groups_by_ids = AsyncMock(return_value=[{"id": 1, **mock_group}])
 
             # Execute
             result = await service.get_group_feed(1, limit=20)
 
+            # Assert authors and the group were resolved once for the whole page,
+            # skipping the post that already has its author
+            mock_users_redis.get_cached_users.assert_awaited_once_with([1, 2])
+            mock_users_pg.get_users_by_ids.assert_awaited_once_with([1, 2])
+            mock_redis.get_cached_groups.assert_awaited_once_with([1])
+            mock_pg.get_groups_by_ids.assert_awaited_once_with([1])
+
             # Assert enrichment
-            assert len(result) == 2
+            assert len(result) == 3
             assert result[0]["author_name"] == "Author 1"
             assert result[1]["author_name"] == "Author 2"
+            assert result[2]["author_name"] == "Author 3"
             assert result[0]["group_name"] == "Test Group"
 
 
@@ -238,5 +458,324 @@ class TestRecommendationService:
             assert result == mock_recommendations
             assert result[0]["mutual_friends"] == 2
 
+    @pytest.mark.asyncio
+    async def test_get_leaderboard_fetches_users_in_one_batch(self):
+        """
+        Test that leaderboard enrichment resolves every ranked user
+        with a single batched lookup instead of one query per rank
+        """
+        from backend.services.recommendation_service import RecommendationService
+
+        service = RecommendationService()
+
+        with patch("backend.services.recommendation_service.redis_client") as mock_redis, \
+             patch("backend.services.recommendation_service.user_service") as mock_users:
+
+            mock_redis.get_leaderboard = AsyncMock(
+                return_value=[{"user_id": 2, "points": 120}, {"user_id": 7, "points": 95}]
+            )
+            mock_users.get_users = AsyncMock(return_value={2: {"full_name": "Top User"}})
+
+            # Execute
+            result = await service.get_leaderboard(limit=2)
+
+            # Assert one batched fetch; users missing everywhere fall back to "Unknown"
+            mock_redis.get_leaderboard.assert_awaited_once_with(2)
+            mock_users.get_users.assert_awaited_once_with([2, 7])
+            assert result == [
+                {"rank": 1, "user_id": 2, "full_name": "Top User", "points": 120},
+                {"rank": 2, "user_id": 7, "full_name": "Unknown", "points": 95},
+            ]
+
+
+
+class TestInsertBatcher:
+    """Test MongoDB insert coalescing"""
+
+    @staticmethod
+    def make_collection():
+        collection = MagicMock()
+        collection.name = "posts"
+
+        async def insert_many(documents, ordered):
+            for index, document in enumerate(documents):
+                document["_id"] = f"id{index}"
+
+        collection.insert_many = AsyncMock(side_effect=insert_many)
+        return collection
+
+    @pytest.mark.asyncio
+    async def test_lone_insert_is_flushed_immediately(self):
+        """A single insert doesn't wait max_wait for company"""
+        from backend.db.mongo import InsertBatcher
+
+        collection = self.make_collection()
+        batcher = InsertBatcher(max_wait=10)
+        batcher.start(collection)
+
+        inserted_id = await asyncio.wait_for(batcher.insert({"title": "a"}), timeout=1)
+
+        assert inserted_id == "id0"
+        collection.insert_many.assert_awaited_once()
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_inserts_share_one_insert_many(self):
+        """Inserts queued together go out in one batch, each getting its own _id"""
+        from backend.db.mongo import InsertBatcher
+
+        collection = self.make_collection()
+        batcher = InsertBatcher(max_wait=0.01)
+        batcher.start(collection)
+
+        ids = await asyncio.gather(*(batcher.insert({"n": n}) for n in range(5)))
+
+        assert ids == ["id0", "id1", "id2", "id3", "id4"]
+        collection.insert_many.assert_awaited_once()
+        assert len(collection.insert_many.call_args.args[0]) == 5
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_bulk_write_error_fails_only_bad_documents(self):
+        """A BulkWriteError fails the futures of the rejected documents only"""
+        from pymongo.errors import BulkWriteError, WriteError
+        from backend.db.mongo import InsertBatcher
+
+        collection = self.make_collection()
+
+        async def insert_many(documents, ordered):
+            for index, document in enumerate(documents):
+                document["_id"] = f"id{index}"
+            raise BulkWriteError(
+                {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]}
+            )
+
+        collection.insert_many = AsyncMock(side_effect=insert_many)
+        batcher = InsertBatcher(max_wait=0.01)
+        batcher.start(collection)
+
+        results = await asyncio.gather(
+            *(batcher.insert({"n": n}) for n in range(3)), return_exceptions=True
+        )
+
+        assert results[0] == "id0"
+        assert isinstance(results[1], WriteError)
+        assert results[2] == "id2"
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_insert_while_stopping_falls_back_to_insert_one(self):
+        """An insert racing stop() is written directly instead of stranded in the queue"""
+        from backend.db.mongo import InsertBatcher
+
+        collection = self.make_collection()
+        collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="direct"))
+        batcher = InsertBatcher(max_wait=0.01)
+        batcher.start(collection)
+
+        stopping = asyncio.create_task(batcher.stop())
+        await asyncio.sleep(0)
+        inserted_id = await asyncio.wait_for(batcher.insert({"title": "late"}), timeout=1)
+        await stopping
+
+        assert inserted_id == "direct"
+        collection.insert_one.assert_awaited_once()
+
+
+class TestPointsBatcher:
+    """Test leaderboard increment coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_increments_are_coalesced_per_user(self):
+        """Several increments for one user become one ZINCRBY of their sum"""
+        from backend.db.redis import PointsBatcher
+
+        fake = fakeredis.FakeAsyncRedis()
+        batcher = PointsBatcher("leaderboard:points", max_wait=0.01)
+        batcher.start(fake)
+
+        batcher.add(1, 5)
+        batcher.add(1, 2)
+        batcher.add(2, 1)
+        await batcher.stop()
+
+        assert await fake.zscore("leaderboard:points", "1") == 7
+        assert await fake.zscore("leaderboard:points", "2") == 1
+
+    @pytest.mark.asyncio
+    async def test_adds_racing_stop_are_not_lost(self):
+        """
+        Points added during stop()'s final flush still reach Redis:
+        1. add() on the batcher is flushed before _run returns
+        2. increment_user_points writes directly once stopping
+        """
+        async with connected_redis_client() as (client, fake):
+            flushing, release = asyncio.Event(), asyncio.Event()
+            real_pipeline = fake.pipeline
+
+            def gated_pipeline(*args, **kwargs):
+                pipe = real_pipeline(*args, **kwargs)
+                execute = pipe.execute
+
+                async def gated_execute(*a, **kw):
+                    flushing.set()
+                    await release.wait()
+                    return await execute(*a, **kw)
+
+                pipe.execute = gated_execute
+                return pipe
+
+            await client.increment_user_points(1, 5)
+            with patch.object(fake, "pipeline", side_effect=gated_pipeline):
+                stopping = asyncio.create_task(client._points.stop())
+                await flushing.wait()
+                client._points.add(2, 10)
+                release.set()
+                await client.increment_user_points(3, 4)
+                await stopping
+
+            assert await fake.zscore("leaderboard:points", "1") == 5
+            assert await fake.zscore("leaderboard:points", "2") == 10
+            assert await fake.zscore("leaderboard:points", "3") == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        """A flush that fails is merged back and sent with the next window"""
+        from redis.exceptions import ConnectionError
+        from backend.db.redis import PointsBatcher
+
+        fake = fakeredis.FakeAsyncRedis()
+        real_pipeline = fake.pipeline
+        failures = [ConnectionError("connection reset")]
+
+        def flaky_pipeline(*args, **kwargs):
+            pipe = real_pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def flaky_execute(*a, **kw):
+                if failures:
+                    raise failures.pop()
+                return await execute(*a, **kw)
+
+            pipe.execute = flaky_execute
+            return pipe
+
+        batcher = PointsBatcher("leaderboard:points", max_wait=0.01)
+        with patch.object(fake, "pipeline", side_effect=flaky_pipeline):
+            batcher.start(fake)
+            batcher.add(1, 5)
+            await asyncio.sleep(0.1)
+            await batcher.stop()
+
+        assert not failures
+        assert await fake.zscore("leaderboard:points", "1") == 5
+
+
+class TestLocalCache:
+    """Test the in-process cache in front of Redis"""
+
+    def test_returned_values_are_copies(self):
+        """Mutating a value read from (or written to) the cache doesn't change it"""
+        from backend.db.redis import LocalCache
+
+        cache = LocalCache(maxsize=10, ttl=30)
+        user = {"id": 1, "full_name": "Alice"}
+        cache.set("user:1", user)
+        user["full_name"] = "Mallory"
+        cache.get("user:1")["full_name"] = "Mallory"
+
+        assert cache.get("user:1") == {"id": 1, "full_name": "Alice"}
+
+    def test_pop_during_refill_rejects_stale_set(self):
+        """A refill that loaded before an invalidation is not cached"""
+        from backend.db.redis import LocalCache
+
+        cache = LocalCache(maxsize=10, ttl=30)
+        generation = cache.generation("user:1")
+        cache.pop("user:1")
+        cache.set("user:1", {"v": "stale"}, generation)
+
+        assert cache.get("user:1") is None
+
+        cache.set("user:1", {"v": "fresh"}, cache.generation("user:1"))
+        assert cache.get("user:1") == {"v": "fresh"}
+
+    def test_reset_of_pop_stamps_still_rejects_stale_set(self):
+        """Pops that overflow (and reset) the stamp table can't readmit an old refill"""
+        from backend.db.redis import LocalCache
+
+        cache = LocalCache(maxsize=2, ttl=30)
+        generation = cache.generation("user:1")
+        cache.pop("user:1")
+        cache.pop("user:2")
+        cache.pop("user:3")  # table full: stamps reset
+        cache.set("user:1", {"v": "stale"}, generation)
+
+        assert cache.get("user:1") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_racing_read_through_is_not_cached_locally(self):
+        """A Redis read that an invalidation overtakes isn't kept in-process"""
+        async with connected_redis_client() as (client, fake):
+            await client.cache_user(1, {"id": 1, "full_name": "Alice"})
+            client._local.clear()
+            real_get = fake.get
+
+            async def racing_get(key):
+                data = await real_get(key)
+                await client.invalidate_user_cache(1)
+                return data
+
+            with patch.object(fake, "get", side_effect=racing_get):
+                await client.get_cached_user(1)
+
+            assert client._local.get("user:1") is None
+
+
+class TestVersionedRedisKeys:
+    """Test versioned group/member-set keys and the post recording script"""
+
+    @pytest.mark.asyncio
+    async def test_group_version_bump_hides_stale_summary(self):
+        """A summary loaded before an invalidation lands under a version nobody reads"""
+        async with connected_redis_client() as (client, fake):
+            version = await client.get_group_version(1)
+            await client.invalidate_group_cache(1)
+            await client.cache_group(1, {"id": 1, "member_count": 3}, version=version)
+
+            assert await client.get_cached_group(1) is None
+
+            version = await client.get_group_version(1)
+            await client.cache_group(1, {"id": 1, "member_count": 4}, version=version)
+            assert (await client.get_cached_group(1))["member_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_member_set_version_bump_hides_stale_refill(self):
+        """A member set loaded before a join/leave is never consulted"""
+        async with connected_redis_client() as (client, fake):
+            await client.cache_group_members(1, [1, 2])
+            assert await client.is_member_cached(2, 1) is True
+
+            version = await client.get_group_members_version(1)
+            await client.invalidate_group_members(1)  # user 2 leaves
+            await client.cache_group_members(1, [1, 2], version=version)
+
+            assert await client.is_member_cached(2, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_record_post_writes_hot_post_activity_and_points(self):
+        """record_post scores the post by server time, appends activity, awards points"""
+        async with connected_redis_client() as (client, fake):
+            async with client.pipeline() as pipe:
+                await client.record_post("p1", 1, 7, {"type": "post"}, pipe=pipe)
+                await client.record_post("p2", 1, 7, {"type": "post"}, pipe=pipe)
+                await pipe.execute()
+
+            assert set(await client.get_hot_posts()) == {"p1", "p2"}
+            assert await fake.zscore("hot:posts", "p1") > 0
+            activity = await client.get_recent_activity(1)
+            assert [a["type"] for a in activity] == ["post", "post"]
+            assert await fake.zscore("leaderboard:points", "7") == 20
+
 
 # Run tests with: pytest backend/tests/test_services.py -v
@@ -28,6 +28,8 @@ CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_group_memberships_user ON group_memberships(user_id);
 CREATE INDEX idx_group_memberships_group ON group_memberships(group_id);
 CREATE INDEX idx_groups_course_code ON groups(course_code);
+-- text_pattern_ops lets course_code LIKE 'CS%' prefix searches use an index range scan
+CREATE INDEX idx_groups_course_code_prefix ON groups(course_code text_pattern_ops);
 
 -- Grant privileges
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO campus_admin;
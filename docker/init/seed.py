@@ -6,6 +6,8 @@ Demonstrates polyglot persistence initialization
 import asyncio
 import sys
 import os
+import traceback
+import logging
 
 # Add backend to path
 sys.path.insert(0, "/app")
@@ -15,50 +17,57 @@ from backend.db.redis import redis_client
 from backend.db.mongo import mongo_client
 from backend.db.neo4j import neo4j_client
 
+# Per-row progress goes to DEBUG; section headers and per-phase summaries are
+# printed, so a normal run writes a couple of lines per phase
+log = logging.getLogger("seed")
+
 print("=" * 60)
 print("CampusConnect Seed Script")
 print("=" * 60)
 
 
-async def seed_data():
-    """Seed all databases with demo data"""
-
-    # Connect to all databases
-    print("\n1. Connecting to databases...")
-    await postgres_client.connect()
-    await redis_client.connect()
-    await mongo_client.connect()
-    await neo4j_client.connect()
-    print("   ✓ All databases connected")
-
-    # Create users
-    print("\n2. Creating users in PostgreSQL...")
-    users_data = [
-        ("alice@university.edu", "Alice Johnson"),
-        ("bob@university.edu", "Bob Smith"),
-        ("charlie@university.edu", "Charlie Davis"),
-        ("diana@university.edu", "Diana Martinez"),
-        ("eve@university.edu", "Eve Wilson"),
-        ("frank@university.edu", "Frank Brown"),
-    ]
-
-    users = []
-    for email, full_name in users_data:
-        user = await postgres_client.create_user(email, full_name)
-        users.append(user)
-        print(f"   ✓ Created user {user['id']}: {full_name}")
-
-        # Create user node in Neo4j
-        await neo4j_client.create_user_node(
-            user["id"], user["email"], user["full_name"]
-        )
-
-        # Cache in Redis
-        await redis_client.cache_user(user["id"], user)
-
-    print(f"   ✓ Created {len(users)} users across PostgreSQL, Neo4j, and Redis")
-
-    # Create friendships
+# Redis writes for each phase are queued on one pipeline and sent together.
+# Methods called once per row are bound to a local name before the loop
+async def cache_group_summaries(groups):
+    """Cache a fresh (empty) summary for every group"""
+    await redis_client.cache_groups(
+        {group["id"]: {**group, "member_count": 0, "post_count": 0} for group in groups}
+    )
+
+
+async def award_points(user_ids, points):
+    """Award the same number of points to each user id (repeats add up)"""
+    increment_user_points = redis_client.increment_user_points
+    async with redis_client.pipeline() as pipe:
+        for user_id in user_ids:
+            await increment_user_points(user_id, points, pipe=pipe)
+        await pipe.execute()
+
+
+async def record_posts(posts):
+    """Hot posts (scored by the Redis clock), group activity and author points"""
+    record_post = redis_client.record_post
+    async with redis_client.pipeline() as pipe:
+        for post in posts:
+            activity = {
+                "type": "post",
+                "post_id": post["_id"],
+                "author_id": post["author_id"],
+                "group_id": post["group_id"],
+                "title": post["title"],
+            }
+            await record_post(post["_id"], post["group_id"], post["author_id"], activity, pipe=pipe)
+        await pipe.execute()
+
+
+async def add_memberships(memberships):
+    """COPY memberships in their own transaction (seed data: no WAL flush wait)"""
+    async with postgres_client.transaction(synchronous_commit=False):
+        await postgres_client.copy_memberships(memberships)
+
+
+async def seed_friendships(users):
+    """Phase 3: friendships between the seeded users (Neo4j only)"""
     print("\n3. Creating friendships in Neo4j...")
     friendships = [
         (1, 2),  # Alice <-> Bob
@@ -70,35 +79,16 @@ async def seed_data():
         (5, 6),  # Eve <-> Frank
     ]
 
+    # One UNWIND statement for every pair
+    await neo4j_client.create_friendships(friendships)
     for user1_id, user2_id in friendships:
-        await neo4j_client.create_friendship(user1_id, user2_id)
-        print(f"   ✓ Created friendship: User {user1_id} <-> User {user2_id}")
-
-    # Create study groups
-    print("\n4. Creating study groups in PostgreSQL...")
-    groups_data = [
-        ("Database Systems Study Group", "CS-401"),
-        ("Web Development Workshop", "CS-350"),
-        ("Machine Learning Enthusiasts", "CS-520"),
-        ("Algorithms Practice", "CS-310"),
-    ]
-
-    groups = []
-    for name, course_code in groups_data:
-        group = await postgres_client.create_group(name, course_code)
-        groups.append(group)
-        print(f"   ✓ Created group {group['id']}: {name}")
+        log.debug(f"Created friendship: User {user1_id} <-> User {user2_id}")
+    print(f"   ✓ Created {len(friendships)} friendships in Neo4j")
+    return friendships
 
-        # Create group node in Neo4j
-        await neo4j_client.create_group_node(group["id"], group["name"], group["course_code"])
 
-        # Cache in Redis
-        group_summary = {**group, "member_count": 0, "post_count": 0}
-        await redis_client.cache_group(group["id"], group_summary)
-
-    print(f"   ✓ Created {len(groups)} groups across PostgreSQL, Neo4j, and Redis")
-
-    # Add group memberships
+async def seed_memberships(users, groups):
+    """Phase 5: group memberships in PostgreSQL and Neo4j, plus join points"""
     print("\n5. Creating group memberships...")
     memberships = [
         (1, 1, "admin"),    # Alice -> Database Systems (admin)
@@ -115,15 +105,25 @@ async def seed_data():
         (6, 4, "member"),   # Frank -> Algorithms
     ]
 
+    # PostgreSQL insert, Neo4j mirror (one UNWIND statement) and points, concurrently
+    await asyncio.gather(
+        add_memberships(memberships),
+        neo4j_client.create_memberships(
+            [
+                {"user_id": user_id, "group_id": group_id, "role": role}
+                for user_id, group_id, role in memberships
+            ]
+        ),
+        award_points([user_id for user_id, _, _ in memberships], 5),
+    )
     for user_id, group_id, role in memberships:
-        await postgres_client.add_membership(user_id, group_id, role)
-        await neo4j_client.create_membership(user_id, group_id, role)
-        print(f"   ✓ User {user_id} joined Group {group_id} as {role}")
+        log.debug(f"User {user_id} joined Group {group_id} as {role}")
+    print(f"   ✓ Created {len(memberships)} memberships across PostgreSQL and Neo4j")
+    return memberships
 
-        # Award points
-        await redis_client.increment_user_points(user_id, 5)
 
-    # Create posts in MongoDB
+async def seed_posts(users, groups):
+    """Phase 6: posts in MongoDB, then hot posts, activity and points in Redis"""
     print("\n6. Creating posts in MongoDB...")
     posts_data = [
         {
@@ -192,43 +192,117 @@ async def seed_data():
         },
     ]
 
-    import time
-    for post_data in posts_data:
-        post = await mongo_client.create_post(**post_data)
-        print(f"   ✓ Created post: {post_data['title']}")
+    # Denormalize the author onto each post, as post_service.create_post does
+    users_by_id = {user["id"]: user for user in users}
+    for post in posts_data:
+        author = users_by_id[post["author_id"]]
+        post["author_name"] = author["full_name"]
+        post["author_email"] = author["email"]
+
+    # One unordered insert_many for the whole batch, with the unhinted post indexes
+    # rebuilt once afterwards instead of updated per document
+    posts = await mongo_client.bulk_load_posts(posts_data)
+    for post in posts:
+        log.debug(f"Created post: {post['title']}")
 
-        # Add to hot posts
-        timestamp_score = time.time()
-        await redis_client.add_hot_post(post["_id"], timestamp_score)
+    # Hot posts, activity and points in one Redis pipeline
+    await record_posts(posts)
 
-        # Push activity
-        from datetime import datetime
-        activity = {
-            "type": "post",
-            "post_id": post["_id"],
-            "author_id": post_data["author_id"],
-            "group_id": post_data["group_id"],
-            "title": post_data["title"],
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-        await redis_client.push_activity(post_data["group_id"], activity)
+    print(f"   ✓ Created {len(posts)} posts in MongoDB")
+    return posts
 
-        # Award points
-        await redis_client.increment_user_points(post_data["author_id"], 10)
 
-    print(f"   ✓ Created {len(posts_data)} posts in MongoDB")
+async def seed_data():
+    """Seed all databases with demo data"""
+
+    # Connect to all databases
+    print("\n1. Connecting to databases...")
+    await postgres_client.connect()
+    await redis_client.connect()
+    await mongo_client.connect()
+    await neo4j_client.connect()
+    print("   ✓ All databases connected")
+
+    # The user and group rows share one transaction: a single commit instead of
+    # one per statement. It commits before the concurrent phases start, since
+    # those run as separate tasks on their own connections. Demo data is simply
+    # re-seeded after a crash, so the commit skips waiting for the WAL flush
+    async with postgres_client.transaction(synchronous_commit=False):
+        # Create users
+        print("\n2. Creating users in PostgreSQL...")
+        users_data = [
+            ("alice@university.edu", "Alice Johnson"),
+            ("bob@university.edu", "Bob Smith"),
+            ("charlie@university.edu", "Charlie Davis"),
+            ("diana@university.edu", "Diana Martinez"),
+            ("eve@university.edu", "Eve Wilson"),
+            ("frank@university.edu", "Frank Brown"),
+        ]
+
+        # Binary COPY for every row, then one SELECT to read back the ids
+        users = await postgres_client.copy_users(users_data)
+        for user in users:
+            log.debug(f"Created user {user['id']}: {user['full_name']}")
+
+        # Create user nodes in Neo4j (one UNWIND statement) and cache in Redis,
+        # concurrently
+        await asyncio.gather(
+            neo4j_client.create_user_nodes(users),
+            redis_client.cache_users({user["id"]: user for user in users}),
+        )
+
+        print(f"   ✓ Created {len(users)} users across PostgreSQL, Neo4j, and Redis")
+
+        # Create study groups
+        print("\n4. Creating study groups in PostgreSQL...")
+        groups_data = [
+            ("Database Systems Study Group", "CS-401"),
+            ("Web Development Workshop", "CS-350"),
+            ("Machine Learning Enthusiasts", "CS-520"),
+            ("Algorithms Practice", "CS-310"),
+        ]
+
+        # Group names are not unique, so there is no key to read COPYed rows
+        # back by; INSERT ... SELECT FROM unnest() RETURNING hands back the ids
+        groups = await postgres_client.create_groups_bulk(groups_data)
+        for group in groups:
+            log.debug(f"Created group {group['id']}: {group['name']}")
+
+        # Create group nodes in Neo4j (one UNWIND statement) and cache
+        # summaries in Redis, concurrently
+        await asyncio.gather(
+            neo4j_client.create_group_nodes(groups),
+            cache_group_summaries(groups),
+        )
+
+        print(f"   ✓ Created {len(groups)} groups across PostgreSQL, Neo4j, and Redis")
+
+    # Friendships, memberships and posts only depend on users and groups, so
+    # the three phases run concurrently (their output may interleave)
+    friendships, memberships, posts = await asyncio.gather(
+        seed_friendships(users),
+        seed_memberships(users, groups),
+        seed_posts(users, groups),
+    )
+
+    # Migration: friend counts for User nodes written before degree was
+    # maintained on write (and for the friendless users seeded above)
+    await neo4j_client.backfill_user_degrees()
 
     # Add some comments
     print("\n7. Creating comments in MongoDB...")
-    # Get a post to comment on
-    group1_posts = await mongo_client.get_group_posts(1, limit=1)
-    if group1_posts:
-        post_id = group1_posts[0]["_id"]
+    # Comment on the first group-1 post, straight from the inserted batch
+    post_id = next((post["_id"] for post in posts if post["group_id"] == 1), None)
+    commenter = next(user for user in users if user["id"] == 2)
+    if post_id:
         comment = await mongo_client.create_comment(
-            post_id, 2, "Great question! ACID stands for Atomicity, Consistency, Isolation, Durability..."
+            post_id,
+            commenter["id"],
+            "Great question! ACID stands for Atomicity, Consistency, Isolation, Durability...",
+            author_name=commenter["full_name"],
         )
         print(f"   ✓ Created comment on post {post_id}")
-        await redis_client.increment_user_points(2, 2)
+        await redis_client.increment_user_points(commenter["id"], 2)
 
     # Disconnect
     print("\n8. Disconnecting from databases...")
@@ -246,7 +320,7 @@ async def seed_data():
     print(f"  • {len(friendships)} friendships established")
     print(f"  • {len(groups)} study groups created")
     print(f"  • {len(memberships)} group memberships")
-    print(f"  • {len(posts_data)} posts published")
+    print(f"  • {len(posts)} posts published")
     print(f"  • Comments and leaderboard initialized")
     print("\nYou can now access the API at http://localhost:8000")
     print("API docs available at http://localhost:8000/docs")
@@ -254,10 +328,16 @@ async def seed_data():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
     try:
-        asyncio.run(seed_data())
+        run(seed_data())
     except Exception as e:
         print(f"\n❌ Error during seeding: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -125,7 +125,7 @@ echo "  - fastapi"
 echo "  - uvicorn"
 echo "  - asyncpg (PostgreSQL)"
 echo "  - redis"
-echo "  - motor (MongoDB)"
+echo "  - pymongo (MongoDB, native asyncio)"
 echo "  - neo4j"
 echo "  - pydantic"
 echo "  - pytest"